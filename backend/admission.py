@@ -0,0 +1,185 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from cachetools import TTLCache
+from pymongo import ReturnDocument
+
+from metrics import REGISTRY, route_template
+from serialization import dumps
+
+admission_rejected = REGISTRY.counter(
+    'admission_rejected_total',
+    'Requests refused by admission control',
+    ('route_class', 'reason')
+)
+admission_in_flight = REGISTRY.gauge(
+    'admission_in_flight',
+    'Admitted requests currently running per route class',
+    ('route_class',)
+)
+
+
+@dataclass
+class RouteClassLimits:
+    """Per-client token bucket plus a process-wide concurrency cap"""
+    rate: float          # tokens refilled per second, per client
+    burst: int           # bucket size, per client
+    concurrency: int     # requests of this class running at once
+    queue_timeout: float = 0.0  # how long to wait for a concurrency slot
+
+
+class RateLimitBackend:
+    """Token bucket storage. Implementations must make ``acquire`` atomic per key."""
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """Take one token; return 0 if admitted, else seconds until one is available"""
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets; idle clients age out of a bounded TTL cache"""
+
+    def __init__(self, max_clients: int = 100000, idle_ttl: float = 3600):
+        self._buckets = TTLCache(maxsize=max_clients, ttl=idle_ttl)
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - updated) * rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / rate
+
+
+class MongoRateLimitBackend(RateLimitBackend):
+    """Buckets shared by every worker, updated atomically with a pipeline update"""
+
+    def __init__(self, collection, idle_ttl: float = 3600):
+        self.collection = collection
+        self.idle_ttl = idle_ttl
+
+    async def ensure_indexes(self):
+        await self.collection.create_index('expiresAt', expireAfterSeconds=0)
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        now = time.time()
+        refilled = {'$min': [
+            burst,
+            {'$add': [
+                {'$ifNull': ['$tokens', burst]},
+                {'$multiply': [{'$subtract': [now, {'$ifNull': ['$ts', now]}]}, rate]}
+            ]}
+        ]}
+        bucket = await self.collection.find_one_and_update(
+            {'_id': key},
+            [
+                {'$set': {'tokens': refilled, 'ts': now}},
+                {'$set': {'allowed': {'$gte': ['$tokens', 1]}}},
+                {'$set': {
+                    'tokens': {'$cond': ['$allowed', {'$subtract': ['$tokens', 1]}, '$tokens']},
+                    'expiresAt': datetime.utcnow() + timedelta(seconds=self.idle_ttl)
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if bucket['allowed']:
+            return 0.0
+        return (1 - bucket['tokens']) / rate
+
+
+class AdmissionMiddleware:
+    """ASGI admission control for expensive route classes.
+
+    ``routes`` maps route templates to a class name in ``limits``. A request
+    first spends a token from its client's bucket (429 + Retry-After when
+    empty), then takes one of the class's concurrency slots, waiting at most
+    ``queue_timeout`` (503 + Retry-After when none frees up). Other routes
+    pass straight through.
+
+    Clients are the peer address, or with ``client_header`` (X-Forwarded-For
+    style) the entry appended by the outermost of ``trusted_proxies`` proxies:
+    entries to its left are whatever the client sent and cannot be trusted.
+    """
+
+    def __init__(
+        self,
+        app,
+        routes: Dict[str, str],
+        limits: Dict[str, RouteClassLimits],
+        backend: RateLimitBackend,
+        client_header: Optional[str] = None,
+        trusted_proxies: int = 1
+    ):
+        self.app = app
+        self.routes = routes
+        self.limits = limits
+        self.backend = backend
+        self.client_header = client_header.lower().encode() if client_header else None
+        self.trusted_proxies = max(1, trusted_proxies)
+        self._slots = {name: asyncio.Semaphore(limit.concurrency) for name, limit in limits.items()}
+
+    def _client_id(self, scope) -> str:
+        if self.client_header:
+            for name, value in scope.get('headers', ()):
+                if name == self.client_header:
+                    # Each proxy appends the address it saw, so count from the right
+                    entries = value.decode('latin-1').split(',')
+                    return entries[max(0, len(entries) - self.trusted_proxies)].strip()
+        client = scope.get('client')
+        return client[0] if client else 'unknown'
+
+    async def _reject(self, send, status: int, retry_after: float, detail: str):
+        body = dumps({'detail': detail})
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                (b'retry-after', str(max(1, math.ceil(retry_after))).encode()),
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] == 'OPTIONS':
+            await self.app(scope, receive, send)
+            return
+        route_class = self.routes.get(route_template(scope))
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limits[route_class]
+        wait = await self.backend.acquire(f'{route_class}:{self._client_id(scope)}', limit.rate, limit.burst)
+        if wait > 0:
+            admission_rejected.inc(route_class=route_class, reason='rate_limited')
+            await self._reject(send, 429, wait, 'Too many requests, please retry later')
+            return
+
+        slots = self._slots[route_class]
+        try:
+            if limit.queue_timeout > 0:
+                await asyncio.wait_for(slots.acquire(), timeout=limit.queue_timeout)
+            elif slots.locked():
+                raise asyncio.TimeoutError
+            else:
+                await slots.acquire()
+        except asyncio.TimeoutError:
+            admission_rejected.inc(route_class=route_class, reason='overloaded')
+            await self._reject(send, 503, 1, 'Server busy, please retry later')
+            return
+
+        admission_in_flight.inc(route_class=route_class)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_in_flight.dec(route_class=route_class)
+            slots.release()
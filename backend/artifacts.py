@@ -0,0 +1,365 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+from starlette.responses import FileResponse, Response, StreamingResponse
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not on Windows
+    fcntl = None
+
+from metrics import REGISTRY, ratio
+
+prerender_lookups = REGISTRY.counter(
+    'prerender_lookups_total',
+    'Downloads that looked for a prebuilt artifact'
+)
+prerender_hits = REGISTRY.counter(
+    'prerender_hits_total',
+    'Downloads served from an artifact built ahead of traffic (prerender or rerender)'
+)
+REGISTRY.gauge(
+    'prerender_hit_ratio',
+    'Fraction of downloads served from a prebuilt artifact',
+    function=ratio(prerender_hits, prerender_lookups)
+)
+prerender_seconds_saved = REGISTRY.counter(
+    'prerender_latency_saved_seconds_total',
+    'Render and compress time downloads skipped by using prebuilt artifacts'
+)
+store_hits = REGISTRY.counter(
+    'artifact_store_hits_total',
+    'Downloads served from the artifact store, by what built the artifact',
+    ('built_by',)
+)
+range_requests = REGISTRY.counter(
+    'artifact_range_requests_total',
+    'Artifact downloads that sent a Range header, by how it was answered',
+    ('outcome',)
+)
+store_bytes = REGISTRY.gauge(
+    'artifact_store_bytes',
+    'Bytes of artifact objects on disk (shared by workers), as last seen by this worker'
+)
+prerender_builds = REGISTRY.counter(
+    'prerender_builds_total',
+    'Background artifact builds by outcome',
+    ('outcome',)
+)
+
+
+def _timestamp(value) -> str:
+    # MongoDB stores milliseconds; normalise so freshly inserted documents and
+    # documents read back from the database produce the same key
+    if isinstance(value, datetime):
+        return value.replace(microsecond=value.microsecond // 1000 * 1000).isoformat()
+    return str(value)
+
+
+def artifact_key(
+    portfolio: Dict,
+    template: Optional[str] = None,
+    options: str = '',
+    fingerprint: str = ''
+) -> str:
+    """Key identifying one rendering (template version and export options) of one version of a portfolio.
+
+    The version is the stored content hash, so saving unchanged content reuses
+    artifacts; documents not yet normalized fall back to ``updatedAt``. The
+    template fingerprint keeps artifacts built by an older template from matching.
+    """
+    template = template or portfolio['selectedTemplate']
+    if fingerprint:
+        template = f'{template}@{fingerprint}'
+    version = portfolio.get('contentHash') or _timestamp(portfolio.get('updatedAt'))
+    key = f"{portfolio['id']}:{template}:{version}"
+    return f'{key}:{options}' if options else key
+
+
+# Builders that render ahead of traffic; only hits on their artifacts count as prerender hits
+PREBUILDERS = frozenset({'prerender', 'rerender'})
+
+
+class StoredArtifact(NamedTuple):
+    path: str
+    digest: str
+    size: int
+    render_seconds: float
+    built_by: Optional[str] = None
+
+
+def record_hit(artifact: StoredArtifact):
+    """Count a download served from the store, crediting prerendering only for its own artifacts"""
+    store_hits.inc(built_by=artifact.built_by or 'unknown')
+    if artifact.built_by in PREBUILDERS:
+        prerender_hits.inc()
+        prerender_seconds_saved.inc(artifact.render_seconds)
+
+
+class ArtifactStore:
+    """Content-addressed on-disk store of rendered artifacts.
+
+    Layout under ``root``::
+
+        objects/ab/ab12...   artifact bytes, named by SHA-256
+        refs/cd/cd34...      {"digest", "size", "renderSeconds", "builtBy"} per artifact key
+        tmp/                 staging area for atomic writes
+        size                 total object bytes, shared by all workers
+
+    Every write goes to ``tmp/`` and is renamed into place, so readers in other
+    workers never see partial files. Identical outputs share one object.
+    Object mtime tracks last use; when the store grows past ``max_bytes`` the
+    least recently used objects are deleted down to 90% of the cap, and refs
+    pointing at them are pruned. Workers add their writes to the shared
+    ``size`` file under a lock, so the cap holds for all of them together
+    (without ``fcntl`` every write re-scans instead). Keys embed the content hash (or ``updatedAt``)
+    and template fingerprint, so an edited portfolio or changed template never
+    matches an artifact built from an older version.
+    """
+
+    def __init__(self, root, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._objects = self.root / 'objects'
+        self._refs = self.root / 'refs'
+        self._tmp = self.root / 'tmp'
+        self._size_path = self.root / 'size'
+        for directory in (self._objects, self._refs, self._tmp):
+            directory.mkdir(parents=True, exist_ok=True)
+        self._gc_lock = threading.Lock()
+        self._remove_stale_tmp()
+        with self._size_lock() as size_file:
+            self._size = self._set_size(size_file, self._scan()[1])
+
+    @property
+    def _size(self) -> int:
+        """Total object bytes as of this worker's last write or collection"""
+        return self._last_size
+
+    @_size.setter
+    def _size(self, total: int):
+        self._last_size = total
+        store_bytes.set(total)
+
+    def _object_path(self, digest: str) -> Path:
+        return self._objects / digest[:2] / digest
+
+    def _ref_path(self, key: str) -> Path:
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return self._refs / name[:2] / name
+
+    def _write_atomic(self, path: Path, data: bytes):
+        tmp = self._tmp / f'{uuid.uuid4().hex}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        path.parent.mkdir(exist_ok=True)
+        os.replace(tmp, path)
+
+    def _remove_stale_tmp(self, max_age: float = 3600):
+        cutoff = time.time() - max_age
+        for tmp in self._tmp.iterdir():
+            try:
+                if tmp.stat().st_mtime < cutoff:
+                    tmp.unlink()
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def _size_lock(self):
+        """The shared ``size`` file, locked against other workers (None without fcntl)"""
+        if fcntl is None:
+            yield None
+            return
+        with open(self._size_path, 'a+b') as size_file:
+            fcntl.flock(size_file, fcntl.LOCK_EX)
+            yield size_file
+
+    @staticmethod
+    def _set_size(size_file, total: int) -> int:
+        if size_file is not None:
+            size_file.seek(0)
+            size_file.truncate()
+            size_file.write(str(total).encode('ascii'))
+        return total
+
+    def _add_size(self, delta: int) -> int:
+        with self._size_lock() as size_file:
+            if size_file is None:
+                return self._scan()[1]
+            size_file.seek(0)
+            return self._set_size(size_file, int(size_file.read() or 0) + delta)
+
+    def _scan(self):
+        entries = []
+        total = 0
+        for path in self._objects.glob('*/*'):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        return entries, total
+
+    def get(self, key: str) -> Optional[StoredArtifact]:
+        try:
+            ref = json.loads(self._ref_path(key).read_bytes())
+            path = self._object_path(ref['digest'])
+            # Mark as recently used for LRU collection
+            os.utime(path)
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+        return StoredArtifact(str(path), ref['digest'], ref['size'], ref['renderSeconds'], ref.get('builtBy'))
+
+    def put(self, key: str, data: bytes, render_seconds: float, built_by: Optional[str] = None) -> StoredArtifact:
+        """Store data under key; ``built_by`` names what rendered it (e.g. 'prerender') for hit metrics"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._write_atomic(path, data)
+            self._size = self._add_size(len(data))
+        ref = {'digest': digest, 'size': len(data), 'renderSeconds': render_seconds, 'builtBy': built_by}
+        self._write_atomic(self._ref_path(key), json.dumps(ref).encode('utf-8'))
+        if self._size > self.max_bytes:
+            self.collect_garbage()
+        return StoredArtifact(str(path), digest, len(data), render_seconds, built_by)
+
+    def collect_garbage(self):
+        """Evict least recently used objects until under 90% of max_bytes"""
+        # Holding the size lock keeps other workers' writes out of the recount
+        with self._gc_lock, self._size_lock() as size_file:
+            entries, total = self._scan()
+            if total > self.max_bytes:
+                target = self.max_bytes * 0.9
+                for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                    if total <= target:
+                        break
+                    try:
+                        path.unlink()
+                        total -= size
+                    except FileNotFoundError:
+                        pass
+                self._prune_refs()
+            self._size = self._set_size(size_file, total)
+
+    def _prune_refs(self):
+        for ref_path in self._refs.glob('*/*'):
+            try:
+                digest = json.loads(ref_path.read_bytes())['digest']
+                if not self._object_path(digest).exists():
+                    ref_path.unlink()
+            except (FileNotFoundError, ValueError, KeyError):
+                continue
+
+    def clear(self):
+        with self._gc_lock, self._size_lock() as size_file:
+            shutil.rmtree(self._objects, ignore_errors=True)
+            shutil.rmtree(self._refs, ignore_errors=True)
+            self._objects.mkdir(parents=True, exist_ok=True)
+            self._refs.mkdir(parents=True, exist_ok=True)
+            self._size = self._set_size(size_file, 0)
+
+
+RANGE_CHUNK_BYTES = 64 * 1024
+_BYTE_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) for a single-range header, or None to send the whole file.
+
+    Multiple ranges and malformed headers are ignored, which RFC 9110 allows;
+    a well-formed range starting past the end raises RangeNotSatisfiable.
+    """
+    match = _BYTE_RANGE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if end < start:
+        return None
+    return start, end
+
+
+def _read_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(RANGE_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def artifact_response(
+    artifact: StoredArtifact,
+    filename: str,
+    media_type: str,
+    range_header: Optional[str] = None,
+    if_range: Optional[str] = None
+) -> Response:
+    """Serve a stored artifact, honouring a single byte range so clients can resume.
+
+    The object digest is the ETag; a Range sent with a stale If-Range gets the
+    full file, so a resumed download never splices two different versions.
+    """
+    etag = f'"{artifact.digest}"'
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'ETag': etag,
+        'Content-Disposition': f'attachment; filename="{filename}"',
+    }
+    byte_range = None
+    if range_header:
+        if if_range is not None and if_range.strip() != etag:
+            range_requests.inc(outcome='stale')
+        else:
+            try:
+                byte_range = parse_byte_range(range_header, artifact.size)
+            except RangeNotSatisfiable:
+                range_requests.inc(outcome='unsatisfiable')
+                return Response(
+                    status_code=416,
+                    headers={'Content-Range': f'bytes */{artifact.size}', 'Accept-Ranges': 'bytes', 'ETag': etag}
+                )
+            range_requests.inc(outcome='partial' if byte_range else 'ignored')
+
+    if byte_range is None:
+        # Whole file: FileResponse sets Content-Length and uses pathsend where available
+        return FileResponse(artifact.path, media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers['Content-Range'] = f'bytes {start}-{end}/{artifact.size}'
+    headers['Content-Length'] = str(end - start + 1)
+    return StreamingResponse(
+        _read_range(artifact.path, start, end),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
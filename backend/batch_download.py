@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import re
+from typing import AsyncIterator, Dict, List
+
+from starlette.concurrency import run_in_threadpool
+
+from archive import ArchiveWriter, File
+from metrics import REGISTRY
+from profiling import profiled
+from serialization import dumps
+from template_generator import ExportOptions, TemplateGenerator
+
+logger = logging.getLogger(__name__)
+
+batch_portfolios = REGISTRY.counter(
+    'batch_download_portfolios_total',
+    'Portfolios requested in batch downloads by outcome',
+    ('outcome',)
+)
+
+
+def folder_name(portfolio: Dict) -> str:
+    """Archive folder for one portfolio: its name plus an id prefix to keep folders unique"""
+    slug = re.sub(r'[^A-Za-z0-9_-]+', '_', portfolio.get('name') or '').strip('_') or 'portfolio'
+    return f"{slug}_{portfolio['id'][:8]}"
+
+
+def _prepare(generator: TemplateGenerator, writer: ArchiveWriter, portfolio: Dict, options: ExportOptions):
+    folder = folder_name(portfolio)
+    files = generator.export_files(portfolio, portfolio['selectedTemplate'], options)
+    return writer.prepare(sorted(
+        (file._replace(name=f'{folder}/{file.name}') for file in files),
+        key=lambda file: file.name
+    ))
+
+
+async def stream_batch(
+    portfolios: List[Dict],
+    missing: List[str],
+    generator: TemplateGenerator,
+    options: ExportOptions,
+    concurrency: int
+) -> AsyncIterator[bytes]:
+    """Render portfolios on up to ``concurrency`` worker threads into one archive.
+
+    Each portfolio's folder is written as soon as its render and compression
+    finish, so output starts with the first completed portfolio and entries
+    appear in completion order. A ``batch-report.json`` listing included,
+    missing and failed ids closes the archive.
+    """
+    writer = ArchiveWriter(options.format, options.level)
+    slots = asyncio.Semaphore(concurrency)
+    report = {'included': [], 'missing': missing, 'failed': []}
+    batch_portfolios.inc(len(missing), outcome='missing')
+
+    async def render(portfolio: Dict):
+        async with slots:
+            try:
+                return portfolio, await run_in_threadpool(profiled(_prepare), generator, writer, portfolio, options)
+            except Exception as e:
+                logger.error(f"Error rendering portfolio {portfolio['id']} for batch download: {e}")
+                return portfolio, None
+
+    tasks = [asyncio.ensure_future(render(portfolio)) for portfolio in portfolios]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            portfolio, prepared = await completed
+            if prepared is None:
+                report['failed'].append(portfolio['id'])
+                batch_portfolios.inc(outcome='failed')
+                continue
+            report['included'].append(portfolio['id'])
+            batch_portfolios.inc(outcome='included')
+            yield writer.write(prepared)
+        yield writer.write(writer.prepare([File('batch-report.json', dumps(report))])) + writer.finish()
+    finally:
+        # Client went away mid-stream: stop renders that have not started
+        for task in tasks:
+            task.cancel()
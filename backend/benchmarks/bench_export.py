@@ -0,0 +1,59 @@
+"""Size and time of portfolio exports with and without minification.
+
+For each template, compares the default ZIP with ``minify`` and with
+``minify`` + ``precompress``: archive bytes, ``index.html`` bytes as a static
+host would transfer them (raw, gzip, brotli), and generate_zip time. Savings
+are relative to the default export; negative means the variant costs more.
+Finally, the all-templates bundle is timed against three separate exports.
+"""
+import io
+import zipfile
+
+from fixtures import measure, synthetic_portfolio
+
+from archive import brotli
+from template_generator import TEMPLATES, ExportOptions, TemplateGenerator
+
+ITEMS = 100
+VARIANTS = {
+    'default': ExportOptions(),
+    'minify': ExportOptions(minify=True),
+    'minify+precompress': ExportOptions(minify=True, precompress=True),
+}
+
+
+def _index_sizes(zip_bytes: bytes):
+    names = zipfile.ZipFile(io.BytesIO(zip_bytes))
+    sizes = {name: names.getinfo(name).file_size for name in names.namelist()}
+    return sizes['index.html'], sizes.get('index.html.gz'), sizes.get('index.html.br')
+
+
+def main():
+    generator = TemplateGenerator()
+    print(f"brotli: {'yes' if brotli is not None else 'no (.br siblings skipped)'}; {ITEMS} items per section")
+    print(f"{'template':<22}{'variant':<20}{'zip B':>9}{'html B':>9}{'.gz B':>8}{'.br B':>8}{'ms':>9}{'zip saved':>11}{'ms saved':>10}")
+    for template in TEMPLATES:
+        portfolio = synthetic_portfolio(ITEMS, template)
+        base = None
+        for variant, options in VARIANTS.items():
+            zip_bytes = generator.generate_zip(portfolio, template, options=options)
+            timing = measure(lambda: generator.generate_zip(portfolio, template, options=options), repeat=10)
+            html, gz, br = _index_sizes(zip_bytes)
+            if base is None:
+                base = (len(zip_bytes), timing['ms'])
+            size_saved = 1 - len(zip_bytes) / base[0]
+            time_saved = 1 - timing['ms'] / base[1]
+            print(
+                f"{template:<22}{variant:<20}{len(zip_bytes):>9}{html:>9}{gz or '-':>8}{br or '-':>8}"
+                f"{timing['ms']:>9.2f}{size_saved:>11.1%}{time_saved:>10.1%}"
+            )
+
+    portfolio = synthetic_portfolio(ITEMS)
+    separate = measure(lambda: [generator.generate_zip(portfolio, template) for template in TEMPLATES], repeat=30)
+    bundle = measure(lambda: generator.generate_zip(portfolio, TEMPLATES[0], options=ExportOptions(bundle=True)), repeat=30)
+    print(f"\nall templates: 3 exports {separate['ms']:.2f} ms, bundle {bundle['ms']:.2f} ms "
+          f"({1 - bundle['ms'] / separate['ms']:.1%} saved)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Event-loop lag while logging to a slow sink, with and without the queued setup.
+
+A probe coroutine sleeps 1 ms at a time and records how late it wakes up
+while request-like coroutines log large payloads to a stream whose writes
+block (simulating a slow stdout pipe or disk).
+"""
+import asyncio
+import io
+import logging
+import statistics
+import time
+
+import fixtures  # noqa: F401  (puts backend/ on sys.path)
+
+from logging_setup import TEXT_FORMAT, setup_logging, shutdown_logging
+
+WRITE_DELAY = 0.002      # seconds each stream write blocks
+DURATION = 2.0           # seconds per scenario
+LOGS_PER_TICK = 5
+PAYLOAD = 'x' * 20000    # e.g. a whole Gemini response body
+
+
+class SlowStream(io.StringIO):
+    def write(self, text):
+        time.sleep(WRITE_DELAY)
+        return len(text)
+
+
+async def probe(lags, stop_at):
+    interval = 0.001
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def workload(logger, stop_at):
+    while time.perf_counter() < stop_at:
+        for _ in range(LOGS_PER_TICK):
+            logger.info('Response text: %s', PAYLOAD)
+        await asyncio.sleep(0.01)
+
+
+async def scenario():
+    logger = logging.getLogger('bench')
+    lags = []
+    stop_at = time.perf_counter() + DURATION
+    await asyncio.gather(probe(lags, stop_at), workload(logger, stop_at))
+    return lags
+
+
+def configure_sync():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(SlowStream())
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def report(name, lags):
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[int(len(lags_ms) * 0.99) - 1]
+    print(f"{name:<28}{statistics.median(lags_ms):>10.2f}{p99:>10.2f}{lags_ms[-1]:>10.2f}{len(lags_ms):>9}")
+
+
+def main():
+    print(f"{'setup':<28}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'probes':>9}")
+
+    configure_sync()
+    report('sync StreamHandler', asyncio.run(scenario()))
+
+    setup_logging(json_output=True, max_message_chars=2000, stream=SlowStream())
+    report('queued + JSON + 2000 cap', asyncio.run(scenario()))
+    shutdown_logging()
+
+
+if __name__ == '__main__':
+    main()
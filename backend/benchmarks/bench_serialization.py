@@ -0,0 +1,50 @@
+"""Compare the default FastAPI response path with serialization.dumps.
+
+Measures encode time and peak allocations for ``get_portfolio`` responses
+and for building the stored document in ``generate_portfolio``. The plain
+model_dump() build does no normalization, so it is a floor rather than an
+alternative; the two build+normalize cases are the like-for-like comparison.
+"""
+import json
+
+from fixtures import measure, synthetic_portfolio
+
+from fastapi.encoders import jsonable_encoder
+
+from models import Portfolio, PortfolioData, new_portfolio_document
+from normalization import normalize_fields
+from serialization import dumps, orjson
+
+SIZES = (10, 100, 1000)
+
+
+def main():
+    print(f"orjson: {'yes' if orjson is not None else 'no (stdlib fallback)'}")
+    print(f"{'case':<50}{'items':>7}{'ms':>11}{'peak KiB':>12}")
+    for items in SIZES:
+        doc = synthetic_portfolio(items)
+        payload = {'success': True, 'portfolio': doc}
+        data = PortfolioData(**{k: v for k, v in doc.items() if k in PortfolioData.model_fields})
+
+        cases = {
+            'encode: jsonable_encoder + json.dumps': lambda: json.dumps(
+                jsonable_encoder(payload), ensure_ascii=False, separators=(',', ':')
+            ).encode('utf-8'),
+            'encode: serialization.dumps': lambda: dumps(payload),
+            'build: Portfolio(**data).model_dump()': lambda: Portfolio(
+                **data.model_dump(), selectedTemplate='tech-modern'
+            ).model_dump(),
+            'build+normalize: model_dump() + normalize_fields': lambda: normalize_fields(Portfolio(
+                **data.model_dump(), selectedTemplate='tech-modern'
+            ).model_dump()),
+            'build+normalize: new_portfolio_document': lambda: new_portfolio_document(
+                data.model_dump(), 'tech-modern'
+            ),
+        }
+        for name, fn in cases.items():
+            result = measure(fn, repeat=5 if items >= 1000 else 20)
+            print(f"{name:<50}{items:>7}{result['ms']:>11.3f}{result['peak_kib']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
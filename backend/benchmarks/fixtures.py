@@ -0,0 +1,79 @@
+"""Shared helpers for the backend benchmark scripts.
+
+Run scripts from the repository root, e.g.
+``python backend/benchmarks/bench_serialization.py``.
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def synthetic_portfolio(items: int, template: str = 'minimal-professional') -> Dict:
+    """Portfolio document with ``items`` entries in every list section"""
+    now = datetime.utcnow()
+    return {
+        'id': f'bench-{items}',
+        'name': 'Benchmark User',
+        'title': 'Senior Software Engineer',
+        'email': 'bench@example.com',
+        'phone': '+1 555 0100',
+        'about': 'Engineer focused on performance and reliability. ' * 8,
+        'education': [
+            {
+                'institution': f'University {i}',
+                'degree': 'BSc Computer Science',
+                'year': str(2000 + i % 25),
+                'description': 'Graduated with honours; thesis on distributed systems. ' * 2
+            }
+            for i in range(items)
+        ],
+        'skills': [
+            {'name': f'Skill {i}', 'level': 'advanced', 'description': f'Proficient in Skill {i}'}
+            for i in range(items)
+        ],
+        'projects': [
+            {
+                'title': f'Project {i}',
+                'description': 'Built a scalable service handling millions of requests per day. ' * 4,
+                'technologies': 'Python, FastAPI, MongoDB, Redis, Docker, Kubernetes',
+                'link': f'https://example.com/project/{i}'
+            }
+            for i in range(items)
+        ],
+        'experience': [
+            {
+                'company': f'Company {i}',
+                'position': 'Staff Engineer',
+                'duration': '2019 - 2024',
+                'description': 'Led a team of engineers delivering core platform features. ' * 4
+            }
+            for i in range(items)
+        ],
+        'selectedTemplate': template,
+        'createdAt': now,
+        'updatedAt': now
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int = 20) -> Dict[str, float]:
+    """Best wall time over ``repeat`` runs plus peak traced allocation of one run"""
+    fn()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'ms': best * 1000, 'peak_kib': peak / 1024}
@@ -0,0 +1,180 @@
+"""tracemalloc memory regression suite for the render and download paths.
+
+Reports peak and retained allocations of ``TemplateGenerator.generate_html``,
+``TemplateGenerator.iter_html`` (consumed chunk by chunk, as the preview
+endpoint does), ``TemplateGenerator.generate_zip`` and the full ``GET /api/download-portfolio``
+handler (driven through the ASGI app against an in-memory collection) across
+synthetic portfolio sizes. Exits non-zero when any peak grows more than
+``--tolerance`` past ``memory_baseline.json``, so CI can run it directly:
+
+    python backend/benchmarks/memory_suite.py
+    python backend/benchmarks/memory_suite.py --update-baseline
+"""
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+
+from fixtures import BACKEND_DIR, synthetic_portfolio
+
+# server.py connects lazily, but resolves mongodb+srv URLs at import time
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'memory_suite')
+os.environ.setdefault('GEMINI_API_KEY', 'memory-suite')
+# The suite downloads the same portfolio repeatedly from one client
+os.environ.setdefault('ADMISSION_ENABLED', 'false')
+os.environ.setdefault('ARTIFACT_DIR', tempfile.mkdtemp(prefix='memory-suite-artifacts-'))
+
+import server  # noqa: E402
+from template_generator import TemplateGenerator  # noqa: E402
+
+# Per-request INFO logging would dominate the output
+logging.getLogger().setLevel(logging.WARNING)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'memory_baseline.json')
+SIZES = (10, 100, 1000)
+TEMPLATES = ('minimal-professional', 'creative-bold')
+RUNS = 3
+
+
+class _MemoryCollection:
+    """Just enough of a Motor collection for the download handler"""
+
+    def __init__(self, docs):
+        self._docs = {doc['id']: doc for doc in docs}
+
+    async def find_one(self, query, *args, **kwargs):
+        doc = self._docs.get(query.get('id'))
+        return dict(doc) if doc is not None else None
+
+
+async def _download(portfolio_id: str) -> int:
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': f'/api/download-portfolio/{portfolio_id}',
+        'raw_path': f'/api/download-portfolio/{portfolio_id}'.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'memory-suite')],
+        'client': ('127.0.0.1', 0),
+        'server': ('memory-suite', 80),
+    }
+    received = {'status': None, 'bytes': 0}
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Client stays connected; the response cancels this wait when done
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            received['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            received['bytes'] += len(message.get('body', b''))
+
+    await server.app(scope, receive, send)
+    if received['status'] != 200:
+        raise RuntimeError(f"download returned HTTP {received['status']}")
+    return received['bytes']
+
+
+def _trace(fn):
+    """(peak, retained) bytes of one call; retained excludes the return value"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        del result
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before, max(current - before, 0)
+
+
+def run_suite():
+    generator = TemplateGenerator()
+    loop = asyncio.new_event_loop()
+    results = {}
+    for template in TEMPLATES:
+        for items in SIZES:
+            portfolio = synthetic_portfolio(items, template)
+            server.db = SimpleNamespace(portfolios=_MemoryCollection([portfolio]))
+            cases = {
+                'generate_html': lambda: generator.generate_html(portfolio, template),
+                'iter_html': lambda: sum(len(chunk) for chunk in generator.iter_html(portfolio, template)),
+                'generate_zip': lambda: generator.generate_zip(portfolio, template),
+                'download_portfolio': lambda: loop.run_until_complete(_download(portfolio['id'])),
+            }
+            for case, fn in cases.items():
+                fn()  # warm caches and lazy imports outside the measurement
+                samples = []
+                for _ in range(RUNS):
+                    # Measure the cold path: no cached document, no prebuilt artifact
+                    server.portfolio_cache.clear()
+                    server.artifact_store.clear()
+                    samples.append(_trace(fn))
+                peak = min(s[0] for s in samples)
+                retained = min(s[1] for s in samples)
+                results[f'{case}/{template}/{items}'] = {
+                    'peak_kib': round(peak / 1024, 1),
+                    'retained_kib': round(retained / 1024, 1),
+                }
+    loop.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--update-baseline', action='store_true', help='write current results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed peak growth over baseline (default 0.15)')
+    args = parser.parse_args()
+
+    results = run_suite()
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'case':<46}{'peak KiB':>11}{'retained KiB':>14}{'baseline':>11}")
+    for key, result in results.items():
+        base = baseline.get(key, {}).get('peak_kib')
+        flag = ''
+        if base is not None and result['peak_kib'] > base * (1 + args.tolerance):
+            regressions.append(key)
+            flag = '  REGRESSION'
+        base_text = f'{base:.1f}' if base is not None else '-'
+        print(f"{key:<46}{result['peak_kib']:>11.1f}{result['retained_kib']:>14.1f}{base_text:>11}{flag}")
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline written to {os.path.relpath(BASELINE_PATH, os.path.dirname(BACKEND_DIR))}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) exceed the baseline by more than {args.tolerance:.0%}")
+        return 1
+    print('\nMemory within baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
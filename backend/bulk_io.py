@@ -0,0 +1,192 @@
+import asyncio
+import json
+import zlib
+import time
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from models import PortfolioData, new_portfolio_document
+from serialization import dumps
+
+# Hard limit for a single NDJSON record so a missing newline cannot make the
+# importer buffer the whole upload.
+MAX_LINE_BYTES = 4 * 1024 * 1024
+
+# Export output is yielded in chunks of roughly this size
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class LineTooLong(ValueError):
+    """An NDJSON record exceeded MAX_LINE_BYTES; the rest of the stream is unreadable"""
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a byte stream into (line_number, line) pairs, skipping blank lines"""
+    buffer = b''
+    line_no = 0
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b'\n', start)
+            if end == -1:
+                break
+            line_no += 1
+            line = buffer[start:end].strip()
+            start = end + 1
+            if line:
+                yield line_no, line
+        buffer = buffer[start:]
+        if len(buffer) > MAX_LINE_BYTES:
+            raise LineTooLong(f"Line {line_no + 1} exceeds {MAX_LINE_BYTES} bytes")
+    line = buffer.strip()
+    if line:
+        yield line_no + 1, line
+
+
+def parse_portfolio_line(line: bytes, default_template: str) -> Dict:
+    """Validate one NDJSON record and build the document to insert"""
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError('Record must be a JSON object')
+    template = record.pop('selectedTemplate', None) or record.pop('template', None) or default_template
+    data = PortfolioData.model_validate(record)
+    return new_portfolio_document(data.model_dump(), template)
+
+
+def describe_error(error: Exception) -> str:
+    """Short, single-line description of a per-record failure"""
+    if isinstance(error, ValidationError):
+        return '; '.join(
+            f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" for e in error.errors()
+        )
+    return str(error)
+
+
+class BulkImporter:
+    """Insert validated portfolio documents in unordered batches.
+
+    At most one ``insert_many`` is in flight while the next batch is being
+    parsed, so validation and database round-trips overlap.
+    """
+
+    def __init__(self, collection, batch_size: int, max_errors: int = 1000):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+        self._docs: List[Dict] = []
+        self._lines: List[int] = []
+        self._pending = None
+        self._started = time.perf_counter()
+
+    def record_error(self, line_no: int, message: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line_no, 'error': message})
+
+    async def add(self, line_no: int, doc: Dict):
+        self._docs.append(doc)
+        self._lines.append(line_no)
+        if len(self._docs) >= self.batch_size:
+            await self._flush()
+
+    async def _wait_pending(self):
+        # Cleared before awaiting, so an insert that raised is not awaited again
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            await pending
+
+    async def _flush(self):
+        await self._wait_pending()
+        if not self._docs:
+            return
+        docs, lines = self._docs, self._lines
+        self._docs, self._lines = [], []
+        self._pending = asyncio.ensure_future(self._insert(docs, lines))
+
+    async def _insert(self, docs: List[Dict], lines: List[int]):
+        try:
+            result = await self.collection.insert_many(docs, ordered=False)
+            self.inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            write_errors = e.details.get('writeErrors', [])
+            self.inserted += e.details.get('nInserted', len(docs) - len(write_errors))
+            for err in write_errors:
+                self.record_error(lines[err['index']], err.get('errmsg', 'Write error'))
+
+    async def finish(self) -> Dict:
+        """Flush the remaining batch and build the import report"""
+        await self._flush()
+        await self._wait_pending()
+        elapsed = time.perf_counter() - self._started
+        processed = self.inserted + self.failed
+        return {
+            'inserted': self.inserted,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errorsTruncated': self.failed > len(self.errors),
+            'elapsedSeconds': round(elapsed, 3),
+            'rowsPerSecond': round(processed / elapsed, 1) if elapsed > 0 else None,
+        }
+
+    async def abort(self):
+        """Wait for the in-flight insert and drop the unsent batch, for when the import failed"""
+        self._docs, self._lines = [], []
+        await asyncio.gather(self._wait_pending(), return_exceptions=True)
+
+
+def export_query(
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None
+) -> Dict:
+    """Build the Mongo filter for an (incremental) export"""
+    query = {}
+    for field, after, before in (
+        ('createdAt', created_after, created_before),
+        ('updatedAt', updated_after, updated_before),
+    ):
+        bounds = {}
+        if after is not None:
+            bounds['$gte'] = after
+        if before is not None:
+            bounds['$lt'] = before
+        if bounds:
+            query[field] = bounds
+    return query
+
+
+async def export_ndjson(cursor, compress: bool = False) -> AsyncIterator[bytes]:
+    """Stream documents from a Motor cursor as NDJSON, optionally gzip-compressed.
+
+    Only the current cursor batch and one output chunk are held in memory.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending: List[bytes] = []
+    pending_size = 0
+    async for doc in cursor:
+        doc.pop('_id', None)
+        line = dumps(doc) + b'\n'
+        pending.append(line)
+        pending_size += len(line)
+        if pending_size >= EXPORT_CHUNK_BYTES:
+            data = b''.join(pending)
+            pending, pending_size = [], 0
+            if compressor:
+                data = compressor.compress(data)
+            if data:
+                yield data
+    data = b''.join(pending)
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
@@ -0,0 +1,105 @@
+"""Self-hosted web fonts for exported sites.
+
+The template stylesheets pull their fonts with a render-blocking
+``@import`` from fonts.googleapis.com. With local fonts, that import is
+replaced by ``@font-face`` rules (``font-display: swap``) pointing at WOFF2
+files shipped inside the export, and the page preloads the weights used
+above the fold.
+
+Font files come from a local cache directory laid out like the Fontsource
+packages, which ship pre-subsetted latin WOFF2 files::
+
+    <cache>/inter-latin-400-normal.woff2
+    <cache>/poppins-latin-800-normal.woff2
+
+(e.g. copied from ``node_modules/@fontsource/inter/files``). Missing weights
+are skipped and the browser synthesises them; if a family has no files at
+all, the template keeps the remote import.
+"""
+import hashlib
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Dict, NamedTuple, Tuple
+
+logger = logging.getLogger(__name__)
+
+_REMOTE_IMPORT = re.compile(r"@import url\('https://fonts\.googleapis\.com/[^']*'\);\n?")
+
+
+class TemplateFonts(NamedTuple):
+    family: str
+    weights: Tuple[int, ...]
+    preload: Tuple[int, ...]  # body text and hero heading weights
+
+
+TEMPLATE_FONTS: Dict[str, TemplateFonts] = {
+    'minimal-professional': TemplateFonts('Inter', (300, 400, 500, 600, 700), (400, 700)),
+    'creative-bold': TemplateFonts('Poppins', (300, 400, 500, 600, 700, 800), (400, 800)),
+    'tech-modern': TemplateFonts('Inter', (300, 400, 500, 600, 700), (400, 700)),
+}
+
+
+class FontFace(NamedTuple):
+    family: str
+    weight: int
+    path: str  # location inside the export, named by content hash so variable fonts share one file
+    data: bytes
+    preload: bool
+
+
+class FontCache:
+    """Reads WOFF2 files from ``root``; files are loaded once and kept in memory"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._faces: Dict[str, Tuple[FontFace, ...]] = {}
+        self._lock = threading.Lock()
+
+    def faces(self, template: str) -> Tuple[FontFace, ...]:
+        fonts = TEMPLATE_FONTS.get(template, TEMPLATE_FONTS['minimal-professional'])
+        with self._lock:
+            if fonts.family not in self._faces:
+                self._faces[fonts.family] = self._load(fonts)
+            return self._faces[fonts.family]
+
+    def _load(self, fonts: TemplateFonts) -> Tuple[FontFace, ...]:
+        slug = fonts.family.lower().replace(' ', '-')
+        faces = []
+        for weight in fonts.weights:
+            try:
+                data = (self.root / f'{slug}-latin-{weight}-normal.woff2').read_bytes()
+            except FileNotFoundError:
+                continue
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            faces.append(FontFace(fonts.family, weight, f'fonts/{slug}.{digest}.woff2', data,
+                                  weight in fonts.preload))
+        if not faces:
+            logger.warning(f"No {fonts.family} fonts in {self.root}; exports keep the Google Fonts import")
+        return tuple(faces)
+
+
+def font_face_css(faces: Tuple[FontFace, ...]) -> str:
+    return ''.join(
+        f"@font-face {{\n"
+        f"    font-family: '{face.family}';\n"
+        f"    font-style: normal;\n"
+        f"    font-weight: {face.weight};\n"
+        f"    font-display: swap;\n"
+        f"    src: url('{face.path}') format('woff2');\n"
+        f"}}\n\n"
+        for face in faces
+    )
+
+
+def self_host_css(css: str, faces: Tuple[FontFace, ...]) -> str:
+    """Swap the stylesheet's Google Fonts import for local @font-face rules"""
+    if not faces:
+        return css
+    return _REMOTE_IMPORT.sub(lambda _: font_face_css(faces), css, count=1)
+
+
+def preload_links(faces: Tuple[FontFace, ...]) -> str:
+    paths = dict.fromkeys(face.path for face in faces if face.preload)
+    return ''.join(f'<link rel="preload" href="{path}" as="font" type="font/woff2" crossorigin>\n' for path in paths)
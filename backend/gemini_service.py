@@ -2,9 +2,18 @@ import google.generativeai as genai
 import os
 import json
 import logging
+import time
+
+from metrics import REGISTRY
 
 logger = logging.getLogger(__name__)
 
+gemini_duration = REGISTRY.histogram(
+    'gemini_request_duration_seconds',
+    'Gemini enhance call latency by outcome',
+    ('outcome',)
+)
+
 class GeminiService:
     def __init__(self):
         api_key = os.environ.get('GEMINI_API_KEY')
@@ -15,6 +24,7 @@ class GeminiService:
     
     async def enhance_portfolio_content(self, data: dict) -> dict:
         """Use Gemini AI to enhance portfolio content"""
+        start = time.perf_counter()
         try:
             prompt = f"""
 You are a professional career advisor and content writer. Analyze the following portfolio information and enhance it for maximum impact.
@@ -61,15 +71,18 @@ Return ONLY valid JSON in this exact format:
                 result_text = result_text.strip()
             
             enhanced_data = json.loads(result_text)
+            gemini_duration.observe(time.perf_counter() - start, outcome='success')
             logger.info("Successfully enhanced portfolio content with Gemini")
             return enhanced_data
             
         except json.JSONDecodeError as e:
+            gemini_duration.observe(time.perf_counter() - start, outcome='json_parse_fallback')
             logger.error(f"Failed to parse Gemini response: {e}")
-            logger.error(f"Response text: {result_text}")
+            logger.error(f"Response text ({len(result_text)} chars): {result_text[:500]}")
             # Return original data with minor enhancements
             return self._fallback_enhancement(data)
         except Exception as e:
+            gemini_duration.observe(time.perf_counter() - start, outcome='error_fallback')
             logger.error(f"Error enhancing content with Gemini: {e}")
             return self._fallback_enhancement(data)
     
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from metrics import REGISTRY, ratio
+from serialization import orjson
+
+logger = logging.getLogger(__name__)
+
+generate_requests = REGISTRY.counter(
+    'portfolio_generate_requests_total',
+    'Portfolio creation requests received by generate-portfolio'
+)
+generate_deduplicated = REGISTRY.counter(
+    'portfolio_generate_deduplicated_total',
+    'Creation requests answered with an existing portfolioId instead of a new write',
+    ('reason',)
+)
+REGISTRY.gauge(
+    'portfolio_generate_dedupe_ratio',
+    'Fraction of creation requests that were deduplicated',
+    function=ratio(generate_deduplicated, generate_requests)
+)
+
+
+def content_hash(data: dict, template: str, plain: bool = False) -> str:
+    """Stable SHA-256 of the portfolio payload plus template.
+
+    ``plain`` promises that data holds only str-keyed dicts, lists, strings,
+    bools, None and 64-bit ints. orjson encodes those to the same bytes as the
+    stdlib canonical form, several times faster, so it is used when installed.
+    """
+    payload = {'data': data, 'template': template}
+    if plain and orjson is not None:
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class IdempotencyStore:
+    """Maps idempotency keys and content hashes to the portfolio they created.
+
+    Keys are stored as ``_id`` (unique by construction) and expire through a
+    TTL index on ``createdAt``. A claim is ``committed`` once the portfolio it
+    points at has been inserted; until then, for up to ``pending_seconds``, a
+    duplicate is answered with it even though the portfolio is not readable yet.
+    """
+
+    def __init__(self, collection, ttl_seconds: int, pending_seconds: float = 30):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.pending_seconds = pending_seconds
+
+    async def ensure_indexes(self):
+        await self.collection.create_index('createdAt', expireAfterSeconds=self.ttl_seconds)
+        await self.collection.create_index('portfolioId')
+
+    @staticmethod
+    def keys_for(idempotency_key: Optional[str], payload_hash: Optional[str]) -> List[str]:
+        keys = []
+        if idempotency_key:
+            keys.append(f'key:{idempotency_key}')
+        if payload_hash:
+            keys.append(f'hash:{payload_hash}')
+        return keys
+
+    async def claim(
+        self,
+        keys: List[str],
+        portfolio_id: str,
+        holds_content: Optional[Callable[[str, str], Awaitable[bool]]] = None
+    ) -> Optional[str]:
+        """Claim all keys for portfolio_id.
+
+        Returns the portfolioId of an earlier request if any key was already
+        claimed; keys claimed by this call are then re-pointed at it so later
+        retries resolve to the same portfolio. A committed content hash only
+        counts while ``holds_content(portfolioId, hash)`` confirms the portfolio
+        still has that content; otherwise this call takes the claim over.
+        """
+        claimed = []
+        for key in keys:
+            try:
+                await self.collection.insert_one({
+                    '_id': key,
+                    'portfolioId': portfolio_id,
+                    'createdAt': datetime.utcnow(),
+                    'committed': False
+                })
+                claimed.append(key)
+            except DuplicateKeyError:
+                existing = await self.collection.find_one({'_id': key})
+                if not existing:
+                    # Expired between insert and lookup; take it over
+                    await self.collection.replace_one(
+                        {'_id': key},
+                        {'portfolioId': portfolio_id, 'createdAt': datetime.utcnow(), 'committed': False},
+                        upsert=True
+                    )
+                    claimed.append(key)
+                    continue
+                original = existing['portfolioId']
+                if key.startswith('hash:') and holds_content is not None \
+                        and await self._abandoned(existing, key[len('hash:'):], holds_content):
+                    # Edited, deleted or never written: the hash belongs to nobody now
+                    result = await self.collection.replace_one(
+                        {'_id': key, 'portfolioId': original},
+                        {'portfolioId': portfolio_id, 'createdAt': datetime.utcnow(), 'committed': False}
+                    )
+                    if result.modified_count:
+                        claimed.append(key)
+                    continue
+                if claimed:
+                    await self.collection.update_many(
+                        {'_id': {'$in': claimed}},
+                        {'$set': {'portfolioId': original}}
+                    )
+                generate_deduplicated.inc(
+                    reason='idempotency_key' if key.startswith('key:') else 'content_hash'
+                )
+                return original
+        return None
+
+    async def _abandoned(
+        self,
+        claim: dict,
+        payload_hash: str,
+        holds_content: Callable[[str, str], Awaitable[bool]]
+    ) -> bool:
+        # Claims from before the committed flag count as committed
+        if not claim.get('committed', True) \
+                and claim['createdAt'] > datetime.utcnow() - timedelta(seconds=self.pending_seconds):
+            # The original request is still inserting its portfolio
+            return False
+        return not await holds_content(claim['portfolioId'], payload_hash)
+
+    async def commit(self, portfolio_id: str):
+        """Mark the claims for a portfolio as committed once it has been inserted"""
+        await self.collection.update_many(
+            {'portfolioId': portfolio_id, 'committed': False},
+            {'$set': {'committed': True}}
+        )
+
+    async def release(self, keys: List[str], portfolio_id: str):
+        """Drop claims made for a portfolio whose write failed"""
+        if keys:
+            await self.collection.delete_many({'_id': {'$in': keys}, 'portfolioId': portfolio_id})
+
+    async def release_content(self, portfolio_id: str):
+        """Drop content-hash claims for a portfolio whose content changed"""
+        await self.collection.delete_many({'_id': {'$regex': '^hash:'}, 'portfolioId': portfolio_id})
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+job_runs = REGISTRY.counter('admin_job_runs_total', 'Admin background job runs by outcome', ('job', 'outcome'))
+
+
+class BackgroundJob:
+    """An admin-triggered job run in the background, one run at a time.
+
+    ``run`` receives the job and reports progress through ``add``; ``status``
+    is what the admin endpoints return.
+
+    With a ``collection`` the run is shared by every worker: its state is one
+    document keyed by the job name, and the running worker holds a lease it
+    renews (writing progress) every ``lease_seconds / 3``. Other workers refuse
+    to start while the lease is live and report the stored state; a run whose
+    worker died shows as failed once the lease lapses and can be started again.
+    Without a collection the state lives in this process only.
+    """
+
+    def __init__(self, name: str, run: Callable[['BackgroundJob'], Awaitable[None]],
+                 collection=None, lease_seconds: float = 30):
+        self.name = name
+        self._run = run
+        self.collection = collection
+        self.lease_seconds = lease_seconds
+        self.owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._task: Optional[asyncio.Task] = None
+        self.state = 'idle'
+        self.progress: Dict[str, int] = {}
+        self.error: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add(self, **counts: int):
+        for key, count in counts.items():
+            self.progress[key] = self.progress.get(key, 0) + count
+
+    async def start(self) -> bool:
+        """Start a run; False if one is already in progress (on any worker)"""
+        if self.running:
+            return False
+        started_at = datetime.utcnow()
+        if self.collection is not None:
+            try:
+                # Matches only a finished run or a lapsed lease; otherwise the
+                # upsert collides with the live run's document
+                await self.collection.find_one_and_update(
+                    {'_id': self.name, '$or': [{'state': {'$ne': 'running'}}, {'leaseUntil': {'$lt': started_at}}]},
+                    {'$set': {
+                        'state': 'running', 'progress': {}, 'error': None,
+                        'startedAt': started_at, 'finishedAt': None,
+                        'owner': self.owner, 'leaseUntil': started_at + timedelta(seconds=self.lease_seconds)
+                    }},
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                return False
+        self.state = 'running'
+        self.progress = {}
+        self.error = None
+        self.started_at = started_at
+        self.finished_at = None
+        self._task = asyncio.create_task(self._execute())
+        return True
+
+    async def _execute(self):
+        heartbeat = asyncio.create_task(self._heartbeat()) if self.collection is not None else None
+        try:
+            await self._run(self)
+            self.state = 'done'
+        except asyncio.CancelledError:
+            self.state = 'cancelled'
+            raise
+        except Exception as e:
+            self.state = 'failed'
+            self.error = str(e)
+            logger.error(f"Job {self.name} failed: {e}")
+        finally:
+            self.finished_at = datetime.utcnow()
+            if heartbeat is not None:
+                heartbeat.cancel()
+                await self._save({
+                    'state': self.state, 'progress': self.progress, 'error': self.error,
+                    'finishedAt': self.finished_at, 'leaseUntil': None
+                })
+            job_runs.inc(job=self.name, outcome=self.state)
+            logger.info(f"Job {self.name} {self.state}: {self.progress}")
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            lease_until = datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+            if await self._save({'progress': self.progress, 'leaseUntil': lease_until}) is False:
+                # Another worker took over after our lease lapsed (e.g. a long stall)
+                logger.error(f"Job {self.name} lost its lease; stopping")
+                self._task.cancel()
+                return
+
+    async def _save(self, fields: Dict) -> Optional[bool]:
+        """Write fields if this worker still owns the run; None if the write failed"""
+        try:
+            result = await self.collection.update_one({'_id': self.name, 'owner': self.owner}, {'$set': fields})
+        except Exception as e:
+            logger.error(f"Cannot save job {self.name} state: {e}")
+            return None
+        return result.matched_count == 1
+
+    async def cancel(self):
+        if self.running:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def status(self) -> Dict:
+        local = {
+            'job': self.name,
+            'state': self.state,
+            'progress': self.progress,
+            'error': self.error,
+            'startedAt': self.started_at,
+            'finishedAt': self.finished_at,
+        }
+        if self.collection is None or self.running:
+            return local
+        doc = await self.collection.find_one({'_id': self.name})
+        if doc is None:
+            return local
+        status = {
+            'job': self.name,
+            'state': doc.get('state', 'idle'),
+            'progress': doc.get('progress') or {},
+            'error': doc.get('error'),
+            'startedAt': doc.get('startedAt'),
+            'finishedAt': doc.get('finishedAt'),
+        }
+        if status['state'] == 'running' and doc.get('leaseUntil') and doc['leaseUntil'] < datetime.utcnow():
+            status['state'] = 'failed'
+            status['error'] = f"Worker {doc.get('owner')} stopped without finishing the run"
+        return status
+
+
+async def keyset_batches(collection, query: Dict, batch_size: int) -> AsyncIterator[List[Dict]]:
+    """Matching documents in ``_id`` order, ``batch_size`` at a time.
+
+    Each batch resumes after the last ``_id`` seen instead of skipping, so
+    every page is an index range scan however deep the walk goes, and
+    documents inserted or updated meanwhile do not shift the pages.
+    """
+    last_id = None
+    while True:
+        page = dict(query)
+        if last_id is not None:
+            page['_id'] = {'$gt': last_id}
+        batch = await collection.find(page).sort('_id', 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            return
+        last_id = batch[-1]['_id']
+        yield batch
@@ -0,0 +1,124 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from metrics import REGISTRY
+
+log_records_dropped = REGISTRY.counter(
+    'log_records_dropped_total',
+    'Log records dropped because the logging queue was full'
+)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Configured by uvicorn, before the app is imported, with their own stream handlers
+UVICORN_LOGGERS = ('uvicorn', 'uvicorn.error', 'uvicorn.access')
+
+_exception_formatter = logging.Formatter()
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cap text at limit characters, noting how much was cut"""
+    if limit and len(text) > limit:
+        return f"{text[:limit]}... [truncated {len(text) - limit} chars]"
+    return text
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message and optional exc_info"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that caps message size and drops records instead of blocking.
+
+    Formatting of the message (``%`` args) happens here, on the calling
+    thread, so the queued record holds only the already-truncated string.
+    """
+
+    def __init__(self, log_queue: queue.Queue, max_message_chars: int):
+        super().__init__(log_queue)
+        self.max_message_chars = max_message_chars
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = truncate(record.getMessage(), self.max_message_chars)
+        record.args = None
+        if record.exc_info:
+            # Render the traceback now so queued records don't keep frames alive
+            record.exc_text = truncate(_exception_formatter.formatException(record.exc_info), self.max_message_chars * 4)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(
+    level: str = 'INFO',
+    json_output: bool = True,
+    max_message_chars: int = 2000,
+    queue_size: int = 10000,
+    stream=None
+) -> QueueListener:
+    """Route all logging through a queue drained by a background listener thread.
+
+    Request handlers only pay for formatting the message and a non-blocking
+    enqueue; stream writes happen on the listener thread. uvicorn's loggers,
+    including the per-request access log, are re-routed to the same queue.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JSONFormatter() if json_output else logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(BoundedQueueHandler(log_queue, max_message_chars))
+    root.setLevel(level)
+    for name in UVICORN_LOGGERS:
+        server_logger = logging.getLogger(name)
+        for handler in list(server_logger.handlers):
+            server_logger.removeHandler(handler)
+        server_logger.propagate = True
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
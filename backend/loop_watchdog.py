@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+loop_lag = REGISTRY.histogram(
+    'event_loop_lag_seconds',
+    'How late the event loop woke up a periodic heartbeat',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+loop_lag_last = REGISTRY.gauge('event_loop_lag_last_seconds', 'Most recent event loop lag measurement')
+loop_blocked = REGISTRY.counter(
+    'event_loop_blocked_total',
+    'Times the event loop was blocked longer than the watchdog threshold'
+)
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and reports what blocked the loop.
+
+    A heartbeat coroutine wakes every ``interval`` seconds and records how late
+    it was. A daemon thread watches the heartbeat; when it has been stalled for
+    more than ``threshold`` seconds it samples the loop thread's stack, which
+    points at the synchronous code (e.g. a Gemini call or ZIP compression)
+    holding the loop, and logs it once per stall.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, stack_limit: int = 20):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_limit = stack_limit
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._thread.start()
+        logger.info(f"Event loop watchdog started (interval {self.interval}s, threshold {self.threshold}s)")
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - start - self.interval, 0.0)
+            loop_lag.observe(lag)
+            loop_lag_last.set(lag)
+            self._last_beat = time.monotonic()
+
+    def _watch(self):
+        reported_beat = None
+        while not self._stopped.wait(self.interval / 2):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled <= self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            loop_blocked.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            # Innermost frame first so log truncation drops the least useful frames
+            frames = traceback.format_stack(frame, limit=self.stack_limit) if frame else ['<unavailable>\n']
+            stack = ''.join(reversed(frames))
+            logger.warning(f"Event loop blocked for over {stalled:.3f}s; loop thread stack (most recent call first):\n{stack}")
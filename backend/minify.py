@@ -0,0 +1,107 @@
+"""Whitespace and comment minification for generated HTML and CSS.
+
+Deliberately conservative: it only removes what browsers already ignore, so
+output renders identically. Content of ``<pre>``, ``<textarea>``, ``<script>``
+and ``<style>`` elements is left untouched by ``minify_html``.
+"""
+import re
+from typing import Iterable, Iterator
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON = re.compile(r':\s+')
+
+_HTML_RAW = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.S | re.I)
+_HTML_COMMENT = re.compile(r'<!--(?!\[).*?-->', re.S)
+_HTML_SPACES = re.compile(r'[ \t\f]{2,}')
+_HTML_RAW_OPEN = re.compile(r'<(pre|textarea|script|style)\b', re.I)
+
+
+def minify_css(css: str) -> str:
+    css = _CSS_COMMENT.sub('', css)
+    css = _CSS_SPACE.sub(' ', css)
+    css = _CSS_PUNCTUATION.sub(r'\1', css)
+    css = _CSS_COLON.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def _minify_markup(html: str) -> str:
+    html = _HTML_COMMENT.sub('', html)
+    # A run of whitespace renders as one space; keeping line breaks (but not
+    # indentation or blank lines) is just as compact and keeps diffs readable
+    lines = (line.strip() for line in html.splitlines())
+    return _HTML_SPACES.sub(' ', '\n'.join(line for line in lines if line))
+
+
+def minify_html(html: str) -> str:
+    parts = _HTML_RAW.split(html)
+    # split() yields [markup, raw element, tag name, markup, ...]
+    out = []
+    for i in range(0, len(parts), 3):
+        out.append(_minify_markup(parts[i]))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return ''.join(out).strip()
+
+
+def _blank(html: str) -> bool:
+    return not _HTML_COMMENT.sub('', html).strip()
+
+
+def _safe_cut(html: str) -> int:
+    """Index of the last line break minify_html output can be split at, or -1.
+
+    The line after it must be complete, so a tag cut off at the end of the
+    chunk is seen whole. The break must not be inside a raw element or comment
+    (closed or not), nor next to a raw element, since minify_html drops the
+    line breaks around those. Nor may only blank lines and comments follow it:
+    the next chunk could start with a raw element.
+    """
+    raw = [match.span() for match in _HTML_RAW.finditer(html)]
+    opener = _HTML_RAW_OPEN.search(html, raw[-1][1] if raw else 0)
+    if opener:
+        raw.append((opener.start(), len(html)))
+    comments = [match.span() for match in _HTML_COMMENT.finditer(html)]
+    comment = html.rfind('<!--')
+    if comment != -1 and html.find('-->', comment) == -1:
+        comments.append((comment, len(html)))
+    # Complete lines only; the break needs something other than whitespace and
+    # comments after it within them
+    complete = max(html.rfind('\n'), 0)
+    masked = html
+    for start, end in comments:
+        masked = masked[:start] + ' ' * (end - start) + masked[end:]
+    cut = html.rfind('\n', 0, max(len(masked[:complete].rstrip()) - 1, 0))
+    while cut != -1:
+        if any(start < cut < end for start, end in raw + comments) or any(
+            (end <= cut and _blank(html[end:cut])) or (cut < start and _blank(html[cut:start]))
+            for start, end in raw
+        ):
+            cut = html.rfind('\n', 0, cut)
+            continue
+        return cut
+    return -1
+
+
+def minify_html_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """minify_html for a document arriving in chunks; the output joins to the same text.
+
+    Only complete lines are minified, and the trailing partial line is carried
+    into the next chunk, so memory is bounded by the chunk size rather than the
+    document.
+    """
+    pending = ''
+    started = False
+    for chunk in chunks:
+        pending += chunk
+        cut = _safe_cut(pending)
+        if cut == -1:
+            continue
+        done, pending = minify_html(pending[:cut]), pending[cut + 1:]
+        if done:
+            yield '\n' + done if started else done
+            started = True
+    done = minify_html(pending)
+    if done:
+        yield '\n' + done if started else done
@@ -3,6 +3,8 @@ from typing import List, Optional
 from datetime import datetime
 import uuid
 
+from normalization import normalize_fields
+
 class Education(BaseModel):
     institution: str
     degree: str
@@ -52,6 +54,34 @@ class Portfolio(BaseModel):
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
+def new_portfolio_document(data: dict, template: str) -> dict:
+    """Build a stored, normalized Portfolio document from already-validated PortfolioData fields.
+
+    Matches ``normalize_fields(Portfolio(**data, selectedTemplate=template).model_dump())``
+    (up to the generated id and timestamps) without validating and copying every
+    nested section a second time; see normalization.py for the derived fields.
+    """
+    now = datetime.utcnow()
+    return {
+        'id': str(uuid.uuid4()),
+        **normalize_fields({**data, 'selectedTemplate': template}),
+        'createdAt': now,
+        'updatedAt': now
+    }
+
+class PortfolioUpdate(BaseModel):
+    """Partial update: only the fields the client sends are written"""
+    name: Optional[str] = None
+    title: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    about: Optional[str] = None
+    education: Optional[List[Education]] = None
+    skills: Optional[List[Skill]] = None
+    projects: Optional[List[Project]] = None
+    experience: Optional[List[Experience]] = None
+    selectedTemplate: Optional[str] = None
+
 class EnhanceRequest(BaseModel):
     name: str
     title: str
@@ -60,6 +90,11 @@ class EnhanceRequest(BaseModel):
     projects: List[Project]
     experience: List[Experience]
 
+class BatchDownloadRequest(BaseModel):
+    portfolioIds: List[str] = Field(..., min_length=1)
+
 class GenerateRequest(BaseModel):
     data: PortfolioData
-    template: str
\ No newline at end of file
+    template: str
+    # Regenerating an existing portfolio updates it in place
+    portfolioId: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""Write-time normalization of portfolio documents.
+
+Documents are normalized when they are written, so renderers and caches read
+precomputed fields instead of re-deriving them on every download:
+
+- string fields are trimmed (recursively through the section lists),
+- each project gets ``technologyList``, its comma-separated ``technologies``
+  split and trimmed (the raw string is kept for the editor),
+- ``contentHash`` is a stable hash of the content fields and template,
+- ``normalizedVersion`` records which rules produced the fields, so the
+  backfill job can find documents written before them.
+"""
+import logging
+from typing import Any, Dict, Sequence, Tuple, Union
+
+from pymongo import UpdateOne
+
+from idempotency import content_hash
+from jobs import keyset_batches
+
+logger = logging.getLogger(__name__)
+
+# Bump when the rules change; the backfill job re-normalizes older documents
+NORMALIZATION_VERSION = 1
+# The PortfolioData fields: what the user wrote, as opposed to bookkeeping
+CONTENT_FIELDS = ('name', 'title', 'email', 'phone', 'about', 'education', 'skills', 'projects', 'experience')
+
+
+def split_technologies(technologies: Union[str, Sequence[str], None]) -> Tuple[str, ...]:
+    """A project's comma-separated technologies as a tuple of trimmed names"""
+    if not technologies:
+        return ()
+    if isinstance(technologies, str):
+        technologies = technologies.split(',')
+    return tuple(t.strip() for t in technologies)
+
+
+_INT64 = range(-2 ** 63, 2 ** 63)
+
+
+def _trim(value: Any, unusual: list) -> Any:
+    """Trimmed copy of value; appends to ``unusual`` when a leaf is not plain JSON.
+
+    Floats, datetimes, non-string keys and the like hash through the stdlib
+    encoder, so the flag keeps ``content_hash`` byte-compatible.
+    """
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return [_trim(item, unusual) for item in value]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            unusual.append(value)
+        return {key: _trim(item, unusual) for key, item in value.items()}
+    if not (value is None or isinstance(value, bool) or (isinstance(value, int) and value in _INT64)):
+        unusual.append(value)
+    return value
+
+
+def _trim_projects(projects: Any, unusual: list) -> Any:
+    # A stale technologyList is derived data: it is dropped, not trimmed
+    if not isinstance(projects, list):
+        return _trim(projects, unusual)
+    return [
+        {key: _trim(item, unusual) for key, item in proj.items() if key != 'technologyList'}
+        if isinstance(proj, dict) else _trim(proj, unusual)
+        for proj in projects
+    ]
+
+
+def normalize_fields(fields: Dict) -> Dict:
+    """Trimmed copy of the content fields present in ``fields``, with derived project fields.
+
+    Other keys are passed through. ``contentHash`` is added only when every
+    content field and the template are present, since it covers all of them.
+    The content is trimmed in one pass and hashed before ``technologyList`` is
+    added, so no further copies are made.
+    """
+    normalized = dict(fields)
+    unusual = []
+    for field in CONTENT_FIELDS:
+        if field == 'projects' and 'projects' in fields:
+            normalized['projects'] = _trim_projects(fields['projects'], unusual)
+        elif field in fields:
+            normalized[field] = _trim(fields[field], unusual)
+    if all(field in normalized for field in CONTENT_FIELDS) and 'selectedTemplate' in normalized:
+        content = {field: normalized[field] for field in CONTENT_FIELDS}
+        if content['projects'] is None:
+            content['projects'] = []
+        normalized['contentHash'] = content_hash(content, normalized['selectedTemplate'], plain=not unusual)
+        normalized['normalizedVersion'] = NORMALIZATION_VERSION
+    if normalized.get('projects'):
+        for proj in normalized['projects']:
+            if isinstance(proj, dict):
+                proj['technologyList'] = list(split_technologies(proj.get('technologies')))
+    return normalized
+
+
+def normalized_update(doc: Dict) -> Dict:
+    """The ``$set`` that brings a stored document up to the current rules"""
+    normalized = normalize_fields({key: doc[key] for key in (*CONTENT_FIELDS, 'selectedTemplate') if key in doc})
+    normalized.pop('selectedTemplate', None)
+    return normalized
+
+
+async def backfill_normalization(collection, job, batch_size: int = 500, on_updated=None):
+    """Normalize documents written before NORMALIZATION_VERSION, in ``_id`` order.
+
+    Each update matches the ``updatedAt`` it read, so a document edited in the
+    meantime (and normalized by that write) is left alone. ``on_updated`` is
+    called with each updated portfolio id, e.g. to drop it from caches.
+    """
+    job.add(processed=0, updated=0, skipped=0, failed=0)
+    query = {'normalizedVersion': {'$ne': NORMALIZATION_VERSION}}
+    async for batch in keyset_batches(collection, query, batch_size):
+        requests = []
+        for doc in batch:
+            try:
+                requests.append(UpdateOne(
+                    {'_id': doc['_id'], 'updatedAt': doc.get('updatedAt')},
+                    {'$set': normalized_update(doc)}
+                ))
+            except Exception as e:
+                job.add(failed=1)
+                logger.error(f"Cannot normalize portfolio {doc.get('id')}: {e}")
+        if requests:
+            result = await collection.bulk_write(requests, ordered=False)
+            job.add(updated=result.modified_count, skipped=len(requests) - result.matched_count)
+            if on_updated is not None:
+                for doc in batch:
+                    on_updated(doc.get('id'))
+        job.add(processed=len(batch))
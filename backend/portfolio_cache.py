@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+from cachetools import TTLCache
+from pymongo.errors import OperationFailure
+
+from metrics import REGISTRY, ratio
+
+logger = logging.getLogger(__name__)
+
+cache_hits = REGISTRY.counter('portfolio_cache_hits_total', 'Portfolio reads served from the in-process cache')
+cache_misses = REGISTRY.counter('portfolio_cache_misses_total', 'Portfolio reads that went to MongoDB')
+cache_lookups = REGISTRY.counter('portfolio_cache_lookups_total', 'Portfolio reads through the cache')
+cache_invalidations = REGISTRY.counter(
+    'portfolio_cache_invalidations_total',
+    'Cached portfolios dropped because they changed',
+    ('source',)
+)
+REGISTRY.gauge(
+    'portfolio_cache_hit_ratio',
+    'Fraction of portfolio reads served from the cache',
+    function=ratio(cache_hits, cache_lookups)
+)
+
+
+class PortfolioCache:
+    """Read-through, TTL- and size-bounded cache of portfolio documents.
+
+    Documents are cached without ``_id``; the ObjectId is remembered separately
+    so change stream events (which only carry ``documentKey._id``) can be
+    mapped back to the portfolio ``id``. Concurrent misses for the same id
+    share one database read.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._object_ids: Dict[object, str] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        REGISTRY.gauge('portfolio_cache_entries', 'Portfolios currently cached', function=lambda: len(self._cache))
+
+    async def get(self, portfolio_id: str, loader: Callable[[str], Awaitable[Optional[Dict]]]) -> Optional[Dict]:
+        cache_lookups.inc()
+        doc = self._cache.get(portfolio_id)
+        if doc is not None:
+            cache_hits.inc()
+            return dict(doc)
+
+        cache_misses.inc()
+        inflight = self._inflight.get(portfolio_id)
+        if inflight is not None:
+            doc = await asyncio.shield(inflight)
+            return dict(doc) if doc is not None else None
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[portfolio_id] = future
+        try:
+            doc = await loader(portfolio_id)
+            if doc is not None:
+                object_id = doc.pop('_id', None)
+                # An invalidation may have raced the read; only cache if still current
+                if self._inflight.get(portfolio_id) is future:
+                    self._store(portfolio_id, object_id, doc)
+            future.set_result(doc)
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(portfolio_id) is future:
+                del self._inflight[portfolio_id]
+        return dict(doc) if doc is not None else None
+
+    def _store(self, portfolio_id: str, object_id, doc: Dict):
+        self._cache[portfolio_id] = doc
+        if object_id is not None:
+            if len(self._object_ids) > 2 * self._cache.maxsize:
+                # Entries expired or evicted from the TTLCache leave stale mappings behind
+                live = set(self._cache.keys())
+                self._object_ids = {oid: pid for oid, pid in self._object_ids.items() if pid in live}
+            self._object_ids[object_id] = portfolio_id
+
+    def invalidate(self, portfolio_id: str, source: str = 'local'):
+        self._inflight.pop(portfolio_id, None)
+        if self._cache.pop(portfolio_id, None) is not None:
+            cache_invalidations.inc(source=source)
+
+    def invalidate_object_id(self, object_id, source: str = 'change_stream'):
+        portfolio_id = self._object_ids.pop(object_id, None)
+        if portfolio_id is not None:
+            self.invalidate(portfolio_id, source)
+
+    def clear(self):
+        self._cache.clear()
+        self._object_ids.clear()
+        self._inflight.clear()
+
+    async def watch(self, collection, retry_delay: float = 5.0):
+        """Invalidate entries from a MongoDB change stream until cancelled.
+
+        Requires a replica set (a single-node one is enough locally). On a
+        standalone server the watcher stops and entries expire by TTL only.
+        """
+        pipeline = [{'$match': {'operationType': {'$in': ['update', 'replace', 'delete']}}}]
+        while True:
+            try:
+                async with collection.watch(pipeline) as stream:
+                    logger.info("Portfolio cache watching change stream")
+                    async for change in stream:
+                        self.invalidate_object_id(change['documentKey']['_id'])
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                logger.warning(f"Change streams unavailable, cache relies on TTL and local invalidation: {e}")
+                return
+            except Exception as e:
+                # Events may have been missed while disconnected
+                logger.error(f"Portfolio cache change stream failed, retrying: {e}")
+                self.clear()
+                await asyncio.sleep(retry_delay)
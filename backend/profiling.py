@@ -0,0 +1,209 @@
+import cProfile
+import functools
+import hmac
+import io
+import marshal
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+PROFILE_HEADER = b'x-profile'
+
+T = TypeVar('T')
+
+
+class _CapturedStats:
+    """Minimal profiler stand-in that pstats.Stats can load captured stats from"""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class _Capture:
+    """Profiles of worker threads doing work for the request being profiled.
+
+    cProfile only follows the thread that enabled it, so each call handed to a
+    thread gets its own profiler, merged into the request's profile at the end.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Threads already under a profiler; enabling another would replace it
+        self._threads = {threading.get_ident()}
+        self.stats: List[Dict] = []
+
+    def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        ident = threading.get_ident()
+        with self._lock:
+            nested = ident in self._threads
+            self._threads.add(ident)
+        if nested:
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+: the request's profiler already covers every thread
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                profiler.create_stats()
+                with self._lock:
+                    self.stats.append(profiler.stats)
+        finally:
+            with self._lock:
+                self._threads.discard(ident)
+
+
+_capture: ContextVar[Optional[_Capture]] = ContextVar('profile_capture', default=None)
+
+
+def profiled(func: Callable[..., T]) -> Callable[..., T]:
+    """``func``, profiled wherever it runs if the current request is being profiled.
+
+    Wrap callables before handing them to a thread pool; outside a profiled
+    request ``func`` is returned as is.
+    """
+    capture = _capture.get()
+    if capture is None:
+        return func
+    return functools.partial(capture.run, func)
+
+
+def profiled_iter(iterable: Iterable[T]) -> Iterable[T]:
+    """``iterable`` with each step profiled, for sync iterators a response consumes on a thread pool"""
+    capture = _capture.get()
+    if capture is None:
+        return iterable
+    iterator = iter(iterable)
+    sentinel = object()
+
+    def steps() -> Iterator[T]:
+        while True:
+            item = capture.run(next, iterator, sentinel)
+            if item is sentinel:
+                return
+            yield item
+    return steps()
+
+
+def _merge(stats: List[Dict]) -> Dict:
+    merged = pstats.Stats(_CapturedStats(stats[0]))
+    if len(stats) > 1:
+        merged.add(*(_CapturedStats(thread_stats) for thread_stats in stats[1:]))
+    return merged.stats
+
+
+class ProfileStore:
+    """Bounded in-memory store of captured request profiles (oldest dropped first)"""
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile_id: str, meta: Dict, stats: Dict):
+        with self._lock:
+            self._profiles[profile_id] = {'meta': {'id': profile_id, **meta}, 'stats': stats}
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [entry['meta'] for entry in reversed(self._profiles.values())]
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    @staticmethod
+    def to_pstats(stats: Dict) -> bytes:
+        """Raw profile in the format written by ``cProfile.Profile.dump_stats``"""
+        return marshal.dumps(stats)
+
+    @staticmethod
+    def to_text(stats: Dict, sort: str = 'cumulative', limit: int = 60) -> str:
+        out = io.StringIO()
+        pstats.Stats(_CapturedStats(stats), stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+class ProfilingMiddleware:
+    """Opt-in ASGI middleware capturing a cProfile of selected requests.
+
+    A request is profiled when it carries ``X-Profile: <admin token>`` or is
+    picked by ``sample_rate``. Only one request is profiled at a time; the
+    profile covers everything that runs on the event loop thread while the
+    request is in flight, including GeminiService frames, plus any work the
+    request hands to threads through ``profiled`` / ``profiled_iter`` (renders,
+    compression), so TemplateGenerator and archive frames show up too.
+    Install it only when profiling is enabled so the disabled path costs nothing.
+    """
+
+    def __init__(self, app, store: ProfileStore, token: Optional[str] = None, sample_rate: float = 0.0):
+        self.app = app
+        self.store = store
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self._busy = threading.Lock()
+
+    def _requested(self, scope) -> bool:
+        if self.token:
+            for name, value in scope.get('headers', ()):
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = str(uuid.uuid4())
+        status = {'code': 500}
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+                message['headers'] = list(message.get('headers', [])) + [(b'x-profile-id', profile_id.encode())]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        capture = _Capture()
+        token = _capture.set(capture)
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+        finally:
+            _capture.reset(token)
+            self._busy.release()
+            profiler.create_stats()
+            with capture._lock:
+                stats = _merge([profiler.stats, *capture.stats])
+            meta = {
+                'method': scope['method'],
+                'path': scope['path'],
+                'status': status['code'],
+                'durationMs': round((time.perf_counter() - start) * 1000, 2),
+                'capturedAt': datetime.utcnow().isoformat()
+            }
+            self.store.add(profile_id, meta, stats)
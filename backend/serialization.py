@@ -0,0 +1,41 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from bson import ObjectId
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode plain data (e.g. Mongo documents) to compact UTF-8 JSON.
+
+    Uses orjson when installed, which serializes datetimes natively; falls
+    back to the stdlib encoder with an equivalent ``default`` hook.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that encodes its content directly.
+
+    Returning an instance from a route skips FastAPI's ``jsonable_encoder``
+    pass, which walks and copies every nested value of the document.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,45 +1,179 @@
-from fastapi import FastAPI, APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
 import os
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 import uuid
 from datetime import datetime
-import io
+import asyncio
+import hmac
+import time
 
 from models import (
-    Portfolio, PortfolioData, EnhanceRequest, 
-    GenerateRequest, Education, Skill, Project, Experience
+    Portfolio, PortfolioData, PortfolioUpdate, EnhanceRequest, 
+    GenerateRequest, BatchDownloadRequest, Education, Skill, Project, Experience,
+    new_portfolio_document
 )
 from gemini_service import GeminiService
-from template_generator import TemplateGenerator
+from idempotency import IdempotencyStore, generate_requests
+from metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, MongoCommandMetrics
+from portfolio_cache import PortfolioCache
+from serialization import FastJSONResponse
+from profiling import ProfileStore, ProfilingMiddleware, profiled, profiled_iter
+from logging_setup import setup_logging, shutdown_logging
+from loop_watchdog import LoopWatchdog
+from artifacts import (
+    ArtifactStore, StoredArtifact, artifact_key, artifact_response, prerender_builds, prerender_lookups,
+    record_hit
+)
+from admission import (
+    AdmissionMiddleware, InMemoryRateLimitBackend, MongoRateLimitBackend, RouteClassLimits
+)
+from archive import ARCHIVE_FORMATS
+from batch_download import stream_batch
+from jobs import BackgroundJob, keyset_batches
+from normalization import backfill_normalization, normalize_fields, normalized_update
+from template_generator import EXPORT_FONTS, EXPORT_LAYOUTS, TEMPLATES, ExportOptions, TemplateGenerator
+from bulk_io import (
+    BulkImporter, describe_error, export_ndjson, export_query,
+    LineTooLong, iter_ndjson_lines, parse_portfolio_line
+)
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics()])
 db = client[os.environ['DB_NAME']]
 
+# Default number of documents per insert_many during bulk import
+BULK_IMPORT_BATCH_SIZE = int(os.environ.get('BULK_IMPORT_BATCH_SIZE', '1000'))
+
+# How long idempotency keys / content hashes map to the portfolio they created
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', '600'))
+# Also dedupe identical data + template submissions that carry no Idempotency-Key.
+# Off by default: without auth, two users submitting the same data share one portfolio
+GENERATE_CONTENT_DEDUPE = os.environ.get('GENERATE_CONTENT_DEDUPE', 'false').lower() == 'true'
+
+# In-process portfolio read cache
+PORTFOLIO_CACHE_SIZE = int(os.environ.get('PORTFOLIO_CACHE_SIZE', '1024'))
+PORTFOLIO_CACHE_TTL = float(os.environ.get('PORTFOLIO_CACHE_TTL', '60'))
+PORTFOLIO_CACHE_CHANGE_STREAM = os.environ.get('PORTFOLIO_CACHE_CHANGE_STREAM', 'true').lower() == 'true'
+
+# Admin endpoints and header-triggered profiling require this token
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# On-demand request profiling (middleware is only installed when enabled)
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_MAX_STORED = int(os.environ.get('PROFILE_MAX_STORED', '50'))
+
+# Event loop lag watchdog
+LOOP_WATCHDOG_ENABLED = os.environ.get('LOOP_WATCHDOG_ENABLED', 'false').lower() == 'true'
+LOOP_WATCHDOG_INTERVAL = float(os.environ.get('LOOP_WATCHDOG_INTERVAL', '0.1'))
+LOOP_WATCHDOG_THRESHOLD = float(os.environ.get('LOOP_WATCHDOG_THRESHOLD', '0.25'))
+
+# Admission control for expensive endpoints: per-client token buckets
+# (rate/sec + burst) and per-process concurrency caps per route class
+ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'true').lower() == 'true'
+ADMISSION_BACKEND = os.environ.get('ADMISSION_BACKEND', 'memory')
+ADMISSION_CLIENT_HEADER = os.environ.get('ADMISSION_CLIENT_HEADER')
+# Proxies in front of the app that append to ADMISSION_CLIENT_HEADER
+ADMISSION_TRUSTED_PROXIES = int(os.environ.get('ADMISSION_TRUSTED_PROXIES', '1'))
+ADMISSION_LIMITS = {
+    'llm': RouteClassLimits(
+        rate=float(os.environ.get('ADMISSION_LLM_RATE', '0.2')),
+        burst=int(os.environ.get('ADMISSION_LLM_BURST', '5')),
+        concurrency=int(os.environ.get('ADMISSION_LLM_CONCURRENCY', '8')),
+        queue_timeout=float(os.environ.get('ADMISSION_LLM_QUEUE_TIMEOUT', '2'))
+    ),
+    'render': RouteClassLimits(
+        rate=float(os.environ.get('ADMISSION_RENDER_RATE', '1')),
+        burst=int(os.environ.get('ADMISSION_RENDER_BURST', '10')),
+        concurrency=int(os.environ.get('ADMISSION_RENDER_CONCURRENCY', str(2 * (os.cpu_count() or 1)))),
+        queue_timeout=float(os.environ.get('ADMISSION_RENDER_QUEUE_TIMEOUT', '1'))
+    ),
+}
+ADMISSION_ROUTES = {
+    '/api/enhance-content': 'llm',
+    '/api/download-portfolio/{portfolio_id}': 'render',
+    '/api/download-portfolios': 'render',
+    '/api/preview-portfolio/{portfolio_id}': 'render',
+}
+
+# Render download artifacts in the background after generate/update
+PRERENDER_ENABLED = os.environ.get('PRERENDER_ENABLED', 'true').lower() == 'true'
+# Content-addressed artifact store on local disk, shared by workers on this host
+ARTIFACT_DIR = os.environ.get('ARTIFACT_DIR', str(ROOT_DIR / 'artifact_store'))
+ARTIFACT_STORE_MAX_BYTES = int(os.environ.get('ARTIFACT_STORE_MAX_BYTES', str(1024 * 1024 * 1024)))
+
+# Threads compressing archive members in parallel, per render
+EXPORT_COMPRESS_WORKERS = int(os.environ.get('EXPORT_COMPRESS_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Batch downloads: most ids per request, portfolios rendered at once
+BATCH_DOWNLOAD_MAX_IDS = int(os.environ.get('BATCH_DOWNLOAD_MAX_IDS', '100'))
+BATCH_DOWNLOAD_CONCURRENCY = int(os.environ.get('BATCH_DOWNLOAD_CONCURRENCY', str(min(4, os.cpu_count() or 1))))
+
+# Documents per batch when backfilling write-time normalization
+NORMALIZATION_BATCH_SIZE = int(os.environ.get('NORMALIZATION_BATCH_SIZE', '500'))
+# Mass re-render after a template change: portfolios per page, renders at once
+RERENDER_BATCH_SIZE = int(os.environ.get('RERENDER_BATCH_SIZE', '100'))
+RERENDER_CONCURRENCY = int(os.environ.get('RERENDER_CONCURRENCY', '2'))
+# Admin job runs are leased in Mongo so every worker sees one run; a dead worker's run is
+# released after this long
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', '30'))
+
+# Subsetted WOFF2 files bundled into exports requested with fonts=local
+FONT_CACHE_DIR = os.environ.get('FONT_CACHE_DIR', str(ROOT_DIR / 'font_cache'))
+
 # Initialize services
 gemini_service = GeminiService()
-template_generator = TemplateGenerator()
+template_generator = TemplateGenerator(EXPORT_COMPRESS_WORKERS, FONT_CACHE_DIR)
+idempotency_store = IdempotencyStore(db.idempotency_keys, IDEMPOTENCY_TTL_SECONDS)
+portfolio_cache = PortfolioCache(PORTFOLIO_CACHE_SIZE, PORTFOLIO_CACHE_TTL)
+profile_store = ProfileStore(PROFILE_MAX_STORED)
+loop_watchdog = LoopWatchdog(LOOP_WATCHDOG_INTERVAL, LOOP_WATCHDOG_THRESHOLD)
+if ADMISSION_BACKEND == 'mongo':
+    rate_limit_backend = MongoRateLimitBackend(db.rate_limits)
+else:
+    rate_limit_backend = InMemoryRateLimitBackend()
+artifact_store = ArtifactStore(ARTIFACT_DIR, ARTIFACT_STORE_MAX_BYTES)
+service_tasks = []
+# Admin-triggered background jobs, by name; state is shared through db.admin_jobs
+admin_jobs = {
+    'normalize': BackgroundJob('normalize', lambda job: backfill_normalization(
+        db.portfolios, job, NORMALIZATION_BATCH_SIZE, on_updated=portfolio_cache.invalidate
+    ), db.admin_jobs, JOB_LEASE_SECONDS),
+    'rerender': BackgroundJob('rerender', lambda job: rerender_artifacts(job), db.admin_jobs, JOB_LEASE_SECONDS),
+}
 
 # Create the main app without a prefix
 app = FastAPI()
 
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject requests without the configured admin token"""
+    if not ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail='Admin token required')
+
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Operational endpoints, all behind the admin token
+admin_router = APIRouter(prefix="/api/admin", dependencies=[Depends(require_admin)])
+
+# Configure logging: records are queued and written by a background thread
+setup_logging(
+    level=os.environ.get('LOG_LEVEL', 'INFO'),
+    json_output=os.environ.get('LOG_FORMAT', 'json').lower() == 'json',
+    max_message_chars=int(os.environ.get('LOG_MAX_MESSAGE_CHARS', '2000')),
+    queue_size=int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
 )
 logger = logging.getLogger(__name__)
 
@@ -72,83 +206,469 @@ async def enhance_content(request: EnhanceRequest):
         logger.error(f"Error enhancing content: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def load_portfolio(portfolio_id: str):
+    """Fetch a portfolio document from MongoDB"""
+    return await db.portfolios.find_one({'id': portfolio_id})
+
+async def apply_portfolio_update(portfolio_id: str, changes: dict):
+    """$set only the given sections (normalized) and bump updatedAt; returns None if missing"""
+    changes = normalize_fields(changes)
+    changes['updatedAt'] = datetime.utcnow()
+    complete = 'contentHash' in changes
+    updated = await db.portfolios.find_one_and_update(
+        {'id': portfolio_id},
+        # A partial update invalidates the hash until it is recomputed below
+        {'$set': changes} if complete else {'$set': changes, '$unset': {'contentHash': ''}},
+        projection={'_id': 0, 'id': 1, 'updatedAt': 1} if complete else {'_id': 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated and not complete:
+        # The hash covers the whole document, so it needs the merged result;
+        # matching updatedAt leaves it to a newer write that got in between
+        await db.portfolios.update_one(
+            {'id': portfolio_id, 'updatedAt': updated['updatedAt']},
+            {'$set': normalized_update(updated)}
+        )
+    if updated:
+        await idempotency_store.release_content(portfolio_id)
+    portfolio_cache.invalidate(portfolio_id)
+    return updated
+
+async def holds_content(portfolio_id: str, content_hash: str) -> bool:
+    """Whether the portfolio still has the content a dedupe hash was claimed for"""
+    return await db.portfolios.find_one({'id': portfolio_id, 'contentHash': content_hash}, {'_id': 1}) is not None
+
+def download_key(portfolio: dict, options: ExportOptions = ExportOptions()) -> str:
+    """Artifact key for a download, including the template fingerprint (rendered once per process)"""
+    fingerprint = template_generator.fingerprint(portfolio['selectedTemplate'], options)
+    return artifact_key(portfolio, options=options.key(), fingerprint=fingerprint)
+
+def lookup_download(portfolio: dict, options: ExportOptions = ExportOptions()) -> Optional[StoredArtifact]:
+    return artifact_store.get(download_key(portfolio, options))
+
+def render_download(
+    portfolio: dict,
+    options: ExportOptions = ExportOptions(),
+    built_by: str = 'download'
+) -> StoredArtifact:
+    """Render and compress the portfolio archive and keep it as a prebuilt artifact.
+
+    ``built_by`` ('download', 'prerender' or 'rerender') is recorded with it, so
+    only hits on artifacts built ahead of traffic count as prerender hits.
+    """
+    start = time.perf_counter()
+    data = template_generator.generate_archive(portfolio, portfolio['selectedTemplate'], options=options)
+    return artifact_store.put(download_key(portfolio, options), data, time.perf_counter() - start, built_by)
+
+def download_filename(portfolio: dict, extension: str = 'zip', bundle: bool = False) -> str:
+    """Attachment name for a portfolio's archive download"""
+    suffix = '_templates' if bundle else ''
+    return f'{portfolio["name"].replace(" ", "_")}_portfolio{suffix}.{extension}'
+
+async def prerender_portfolio(portfolio_id: str, portfolio: Optional[dict] = None):
+    """Background task: build the download artifact before the user asks for it"""
+    try:
+        if portfolio is None:
+            portfolio = await load_portfolio(portfolio_id)
+            if not portfolio:
+                return
+        if await run_in_threadpool(profiled(lookup_download), portfolio) is not None:
+            return
+        await run_in_threadpool(profiled(render_download), portfolio, built_by='prerender')
+        prerender_builds.inc(outcome='success')
+    except Exception as e:
+        prerender_builds.inc(outcome='error')
+        logger.error(f"Error prerendering portfolio {portfolio_id}: {e}")
+
+async def rerender_artifacts(job: BackgroundJob):
+    """Admin job: build download artifacts for the current template fingerprints.
+
+    Walks every portfolio in keyset order with at most RERENDER_CONCURRENCY
+    renders at once. Portfolios that already have a current artifact count as
+    ``current``; artifacts for old fingerprints are left to LRU eviction.
+    """
+    slots = asyncio.Semaphore(RERENDER_CONCURRENCY)
+    job.add(total=await db.portfolios.estimated_document_count(), processed=0, built=0, current=0, failed=0)
+
+    async def rerender(portfolio: dict):
+        async with slots:
+            try:
+                if await run_in_threadpool(lookup_download, portfolio) is not None:
+                    job.add(current=1)
+                else:
+                    await run_in_threadpool(render_download, portfolio, built_by='rerender')
+                    job.add(built=1)
+            except Exception as e:
+                job.add(failed=1)
+                logger.error(f"Error re-rendering portfolio {portfolio.get('id')}: {e}")
+            job.add(processed=1)
+
+    async for batch in keyset_batches(db.portfolios, {}, RERENDER_BATCH_SIZE):
+        await asyncio.gather(*(rerender(portfolio) for portfolio in batch))
+
 @api_router.post("/generate-portfolio")
-async def generate_portfolio(request: GenerateRequest):
+async def generate_portfolio(
+    request: GenerateRequest,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None)
+):
     """Generate and save portfolio"""
     try:
-        # Create portfolio document
-        portfolio_data = request.data.dict()
-        portfolio = Portfolio(
-            **portfolio_data,
-            selectedTemplate=request.template
+        if request.portfolioId:
+            # Regenerate: update the existing document instead of inserting a copy
+            changes = request.data.model_dump()
+            changes['selectedTemplate'] = request.template
+            updated = await apply_portfolio_update(request.portfolioId, changes)
+            if not updated:
+                raise HTTPException(status_code=404, detail='Portfolio not found')
+            
+            logger.info(f"Portfolio updated with ID: {request.portfolioId}")
+            if PRERENDER_ENABLED:
+                background_tasks.add_task(prerender_portfolio, request.portfolioId)
+            
+            return {
+                'success': True,
+                'portfolioId': request.portfolioId,
+                'message': 'Portfolio updated successfully'
+            }
+        
+        # Create portfolio document (request.data is already validated)
+        portfolio_data = request.data.model_dump()
+        portfolio = new_portfolio_document(portfolio_data, request.template)
+        
+        # Double-clicks and client retries resolve to the first portfolio
+        generate_requests.inc()
+        dedupe_keys = IdempotencyStore.keys_for(
+            idempotency_key,
+            portfolio['contentHash'] if GENERATE_CONTENT_DEDUPE else None
         )
+        original_id = await idempotency_store.claim(dedupe_keys, portfolio['id'], holds_content)
+        if original_id:
+            logger.info(f"Duplicate generate request resolved to portfolio {original_id}")
+            return {
+                'success': True,
+                'portfolioId': original_id,
+                'message': 'Portfolio generated successfully',
+                'deduplicated': True
+            }
         
         # Save to MongoDB
-        await db.portfolios.insert_one(portfolio.dict())
+        try:
+            await db.portfolios.insert_one(portfolio)
+        except Exception:
+            await idempotency_store.release(dedupe_keys, portfolio['id'])
+            raise
+        if dedupe_keys:
+            await idempotency_store.commit(portfolio['id'])
         
-        logger.info(f"Portfolio created with ID: {portfolio.id}")
+        logger.info(f"Portfolio created with ID: {portfolio['id']}")
+        if PRERENDER_ENABLED:
+            background_tasks.add_task(prerender_portfolio, portfolio['id'], portfolio)
         
         return {
             'success': True,
-            'portfolioId': portfolio.id,
+            'portfolioId': portfolio['id'],
             'message': 'Portfolio generated successfully'
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating portfolio: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.patch("/portfolio/{portfolio_id}")
+async def update_portfolio(portfolio_id: str, request: PortfolioUpdate, background_tasks: BackgroundTasks):
+    """Partially update a portfolio, touching only the sections sent"""
+    try:
+        # Whole sections are replaced, with nested defaults filled in
+        changes = {
+            k: v for k, v in request.model_dump().items()
+            if k in request.model_fields_set and v is not None
+        }
+        if not changes:
+            raise HTTPException(status_code=400, detail='No fields to update')
+        
+        updated = await apply_portfolio_update(portfolio_id, changes)
+        if not updated:
+            raise HTTPException(status_code=404, detail='Portfolio not found')
+        
+        logger.info(f"Portfolio {portfolio_id} updated: {', '.join(k for k in changes if k != 'updatedAt')}")
+        if PRERENDER_ENABLED:
+            background_tasks.add_task(prerender_portfolio, portfolio_id)
+        
+        return {
+            'success': True,
+            'portfolioId': portfolio_id,
+            'updatedAt': updated['updatedAt']
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating portfolio: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.post("/import-portfolios", dependencies=[Depends(require_admin)])
+async def import_portfolios(
+    request: Request,
+    template: str = 'minimal-professional',
+    batch_size: int = Query(BULK_IMPORT_BATCH_SIZE, ge=1, le=10000)
+):
+    """Bulk import portfolios from an NDJSON request body"""
+    importer = BulkImporter(db.portfolios, batch_size)
+    try:
+        async for line_no, line in iter_ndjson_lines(request.stream()):
+            try:
+                doc = parse_portfolio_line(line, template)
+            except Exception as e:
+                importer.record_error(line_no, describe_error(e))
+                continue
+            await importer.add(line_no, doc)
+    except LineTooLong as e:
+        # The rest of the stream cannot be split into records: keep what was imported so far
+        importer.record_error(0, str(e))
+    except Exception as e:
+        await importer.abort()
+        logger.error(f"Error importing portfolios: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    report = await importer.finish()
+    logger.info(
+        f"Bulk import finished: {report['inserted']} inserted, {report['failed']} failed, "
+        f"{report['rowsPerSecond']} rows/sec"
+    )
+    return {
+        'success': report['failed'] == 0,
+        **report
+    }
+
+@api_router.get("/export-portfolios", dependencies=[Depends(require_admin)])
+async def export_portfolios(
+    gzip: bool = False,
+    batch_size: int = Query(500, ge=1, le=10000),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None
+):
+    """Stream all (or a createdAt/updatedAt window of) portfolios as NDJSON"""
+    query = export_query(created_after, created_before, updated_after, updated_before)
+    cursor = db.portfolios.find(query, {'_id': 0}).batch_size(batch_size)
+    filename = 'portfolios.ndjson.gz' if gzip else 'portfolios.ndjson'
+    return StreamingResponse(
+        export_ndjson(cursor, compress=gzip),
+        media_type='application/gzip' if gzip else 'application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
 @api_router.get("/portfolio/{portfolio_id}")
 async def get_portfolio(portfolio_id: str):
     """Get portfolio by ID"""
     try:
-        portfolio = await db.portfolios.find_one({'id': portfolio_id})
+        portfolio = await portfolio_cache.get(portfolio_id, load_portfolio)
         if not portfolio:
             raise HTTPException(status_code=404, detail='Portfolio not found')
         
-        # Remove MongoDB _id field
-        portfolio.pop('_id', None)
-        
-        return {
+        # Encode the document directly instead of through jsonable_encoder
+        return FastJSONResponse({
             'success': True,
             'portfolio': portfolio
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching portfolio: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/preview-portfolio/{portfolio_id}")
+async def preview_portfolio(
+    portfolio_id: str,
+    template: Optional[str] = Query(None, pattern=f"^({'|'.join(TEMPLATES)})$"),
+    minify: bool = False
+):
+    """Render the portfolio page, streamed section by section as it is generated"""
+    try:
+        portfolio = await portfolio_cache.get(portfolio_id, load_portfolio)
+        if not portfolio:
+            raise HTTPException(status_code=404, detail='Portfolio not found')
+        
+        # A sync iterator: Starlette renders each chunk on the threadpool
+        chunks = template_generator.iter_html(portfolio, template or portfolio['selectedTemplate'], minify=minify)
+        return StreamingResponse(
+            profiled_iter(chunk.encode('utf-8') for chunk in chunks),
+            media_type='text/html; charset=utf-8'
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error previewing portfolio: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def export_options(
+    layout: str = Query('single', pattern=f"^({'|'.join(EXPORT_LAYOUTS)})$"),
+    minify: bool = False,
+    precompress: bool = False,
+    archive_format: str = Query('zip', alias='format'),
+    level: Optional[int] = None,
+    fonts: str = Query('remote', pattern=f"^({'|'.join(EXPORT_FONTS)})$"),
+    bundle: bool = False
+) -> ExportOptions:
+    """Export options shared by the download endpoints"""
+    try:
+        return ExportOptions(layout, minify, precompress, archive_format, level, fonts, bundle)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @api_router.get("/download-portfolio/{portfolio_id}")
-async def download_portfolio(portfolio_id: str):
-    """Generate and download portfolio as ZIP"""
+async def download_portfolio(
+    portfolio_id: str,
+    options: ExportOptions = Depends(export_options),
+    range_header: Optional[str] = Header(None, alias='Range'),
+    if_range: Optional[str] = Header(None)
+):
+    """Generate and download the portfolio as an archive (supports Range for resuming)"""
     try:
-        # Fetch portfolio from database
-        portfolio = await db.portfolios.find_one({'id': portfolio_id})
+        # Fetch portfolio (cache first, then database)
+        portfolio = await portfolio_cache.get(portfolio_id, load_portfolio)
         if not portfolio:
             raise HTTPException(status_code=404, detail='Portfolio not found')
+        archive_type = ARCHIVE_FORMATS[options.format]
         
-        # Remove MongoDB _id
-        portfolio.pop('_id', None)
+        # Serve the prebuilt artifact for this version if there is one
+        prerender_lookups.inc()
+        artifact = await run_in_threadpool(profiled(lookup_download), portfolio, options)
+        if artifact is not None:
+            record_hit(artifact)
+        else:
+            artifact = await run_in_threadpool(profiled(render_download), portfolio, options)
         
-        # Generate ZIP
-        zip_bytes = template_generator.generate_zip(portfolio, portfolio['selectedTemplate'])
+        # Served from disk, so resumed requests only read the missing bytes
+        return artifact_response(
+            artifact,
+            download_filename(portfolio, archive_type.extension, options.bundle),
+            archive_type.media_type,
+            range_header,
+            if_range
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error downloading portfolio: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.post("/download-portfolios")
+async def download_portfolios(request: BatchDownloadRequest, options: ExportOptions = Depends(export_options)):
+    """Download many portfolios as one archive with a folder each, streamed as renders finish"""
+    try:
+        portfolio_ids = list(dict.fromkeys(request.portfolioIds))
+        if len(portfolio_ids) > BATCH_DOWNLOAD_MAX_IDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f'At most {BATCH_DOWNLOAD_MAX_IDS} portfolios per batch download'
+            )
         
-        # Return as streaming response
+        # One round trip for the whole batch
+        portfolios = await db.portfolios.find(
+            {'id': {'$in': portfolio_ids}}, {'_id': 0}
+        ).to_list(len(portfolio_ids))
+        if not portfolios:
+            raise HTTPException(status_code=404, detail='No portfolios found')
+        found = {portfolio['id'] for portfolio in portfolios}
+        missing = [portfolio_id for portfolio_id in portfolio_ids if portfolio_id not in found]
+        
+        archive_type = ARCHIVE_FORMATS[options.format]
         return StreamingResponse(
-            io.BytesIO(zip_bytes),
-            media_type='application/zip',
-            headers={
-                'Content-Disposition': f'attachment; filename="{portfolio["name"].replace(" ", "_")}_portfolio.zip"'
-            }
+            stream_batch(portfolios, missing, template_generator, options, BATCH_DOWNLOAD_CONCURRENCY),
+            media_type=archive_type.media_type,
+            headers={'Content-Disposition': f'attachment; filename="portfolios.{archive_type.extension}"'}
         )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error downloading portfolio: {e}")
+        logger.error(f"Error starting batch download: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@admin_router.get("/profiles")
+async def list_profiles():
+    """List captured request profiles, newest first"""
+    return {
+        'success': True,
+        'profiles': profile_store.list()
+    }
+
+@admin_router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, format: str = Query('text', pattern='^(text|pstats)$'), sort: str = 'cumulative'):
+    """Fetch a profile as a pstats report or as a raw .prof file"""
+    entry = profile_store.get(profile_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail='Profile not found')
+    
+    if format == 'pstats':
+        return Response(
+            ProfileStore.to_pstats(entry['stats']),
+            media_type='application/octet-stream',
+            headers={'Content-Disposition': f'attachment; filename="{profile_id}.prof"'}
+        )
+    try:
+        return PlainTextResponse(ProfileStore.to_text(entry['stats'], sort=sort))
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f'Unknown sort key: {sort}')
+
+@admin_router.get("/templates")
+async def template_fingerprints():
+    """Current fingerprint of each template's default export"""
+    fingerprints = await run_in_threadpool(profiled(lambda: {t: template_generator.fingerprint(t) for t in TEMPLATES}))
+    return {
+        'success': True,
+        'templates': fingerprints
+    }
+
+@admin_router.get("/jobs/{name}")
+async def get_job(name: str):
+    """Progress of an admin background job"""
+    job = admin_jobs.get(name)
+    if not job:
+        raise HTTPException(status_code=404, detail='Job not found')
+    return await job.status()
+
+@admin_router.post("/jobs/{name}", status_code=202)
+async def start_job(name: str):
+    """Start an admin background job (normalize: backfill write-time normalization;
+    rerender: rebuild download artifacts for the current template fingerprints)"""
+    job = admin_jobs.get(name)
+    if not job:
+        raise HTTPException(status_code=404, detail='Job not found')
+    if not await job.start():
+        raise HTTPException(status_code=409, detail=f'Job {name} is already running')
+    return await job.status()
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # Include the router in the main app
 app.include_router(api_router)
+app.include_router(admin_router)
+
+if PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        token=ADMIN_TOKEN,
+        sample_rate=PROFILE_SAMPLE_RATE
+    )
+
+if ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        routes=ADMISSION_ROUTES,
+        limits=ADMISSION_LIMITS,
+        backend=rate_limit_backend,
+        client_header=ADMISSION_CLIENT_HEADER,
+        trusted_proxies=ADMISSION_TRUSTED_PROXIES
+    )
+
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -158,6 +678,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def create_indexes():
+    await idempotency_store.ensure_indexes()
+    if isinstance(rate_limit_backend, MongoRateLimitBackend):
+        await rate_limit_backend.ensure_indexes()
+
+@app.on_event("startup")
+async def start_cache_invalidation():
+    if PORTFOLIO_CACHE_CHANGE_STREAM:
+        service_tasks.append(asyncio.create_task(portfolio_cache.watch(db.portfolios)))
+
+@app.on_event("startup")
+async def start_loop_watchdog():
+    if LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await loop_watchdog.stop()
+    for job in admin_jobs.values():
+        await job.cancel()
+    for task in service_tasks:
+        task.cancel()
+    await asyncio.gather(*service_tasks, return_exceptions=True)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+
+@app.on_event("shutdown")
+async def flush_logs():
+    shutdown_logging()
\ No newline at end of file
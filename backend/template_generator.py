@@ -1,40 +1,341 @@
-import os
-import zipfile
-import io
-from typing import Dict
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import archive
+from fonts import FontCache, FontFace, preload_links, self_host_css
+from metrics import REGISTRY, SIZE_BUCKETS
+from minify import minify_css, minify_html_stream
+from normalization import split_technologies
+from template_styles import CREATIVE_BOLD_CSS, MINIMAL_PROFESSIONAL_CSS
+
+TEMPLATES = ('minimal-professional', 'creative-bold', 'tech-modern')
+EXPORT_LAYOUTS = ('single', 'multi')
+EXPORT_FONTS = ('remote', 'local')
+# Per-portfolio .br siblings; stylesheets are shared and cached, so they get 11
+PAGE_BROTLI_QUALITY = 9
+# Rendered HTML is emitted in chunks of about this many characters
+HTML_CHUNK_CHARS = 16 * 1024
+
+TEMPLATE_CSS = {
+    'minimal-professional': MINIMAL_PROFESSIONAL_CSS,
+    'creative-bold': CREATIVE_BOLD_CSS,
+    # Similar structure but with tech-focused styling
+    'tech-modern': MINIMAL_PROFESSIONAL_CSS.replace(
+        'font-family: -apple-system',
+        'font-family: "SF Mono", "Monaco", "Inconsolata", "Roboto Mono"'
+    ),
+}
+
+# Exported to compute template fingerprints; fills every optional field so
+# every part of the markup is exercised
+FINGERPRINT_PORTFOLIO = {
+    'id': 'fingerprint',
+    'name': 'Ada Lovelace',
+    'title': 'Engineer',
+    'email': 'ada@example.com',
+    'phone': '+1 555 0100',
+    'about': 'About',
+    'education': [{'institution': 'University', 'degree': 'BSc', 'year': '1835', 'description': 'Mathematics'}],
+    'skills': [{'name': 'Analysis', 'level': 'expert', 'description': 'Engines'}],
+    'projects': [{
+        'title': 'Notes',
+        'description': 'Note G',
+        'technologies': 'Analytical Engine, Punched cards',
+        'link': 'https://example.com'
+    }],
+    'experience': [{'company': 'Babbage', 'position': 'Analyst', 'duration': '1842-1843', 'description': 'Translation'}],
+    'selectedTemplate': 'minimal-professional',
+}
+
+render_duration = REGISTRY.histogram(
+    'template_render_duration_seconds',
+    'Time to render a portfolio to HTML',
+    ('template',)
+)
+compress_duration = REGISTRY.histogram(
+    'template_compress_duration_seconds',
+    'Time to build the archive from rendered files',
+    ('template',)
+)
+output_bytes = REGISTRY.histogram(
+    'template_output_bytes',
+    'Size of generated output',
+    ('template', 'kind'),
+    buckets=SIZE_BUCKETS
+)
+
+
+@dataclass(frozen=True)
+class ExportOptions:
+    """How generate_archive lays out an export; the defaults give the single-file ZIP"""
+    layout: str = 'single'  # 'multi' links a shared styles.<hash>.css instead of inlining it
+    minify: bool = False  # strip indentation and comments from HTML and CSS
+    precompress: bool = False  # add .gz/.br siblings of index.html and the stylesheet
+    format: str = 'zip'  # see archive.ARCHIVE_FORMATS
+    level: Optional[int] = None  # compression level; None for the format's default
+    fonts: str = 'remote'  # 'local' bundles WOFF2 files from the font cache
+    bundle: bool = False  # every template, one subfolder each
+
+    def __post_init__(self):
+        if self.layout not in EXPORT_LAYOUTS:
+            raise ValueError(f"Unknown layout '{self.layout}'")
+        if self.fonts not in EXPORT_FONTS:
+            raise ValueError(f"Unknown fonts option '{self.fonts}'")
+        archive.check_format(self.format, self.level)
+
+    def key(self) -> str:
+        """Non-default options as a short string, for artifact keys"""
+        return ','.join(
+            f'{field.name}={getattr(self, field.name)}'
+            for field in fields(self)
+            if getattr(self, field.name) != field.default
+        )
+
+
+class _SplitProjects:
+    """Projects with ``technologyList``, split as they are iterated for documents stored without it"""
+
+    def __init__(self, projects: List[Dict]):
+        self._projects = projects
+
+    def __iter__(self) -> Iterator[Dict]:
+        for proj in self._projects:
+            if 'technologyList' in proj:
+                yield proj
+            else:
+                yield {**proj, 'technologyList': split_technologies(proj.get('technologies'))}
+
+
+class PortfolioSections:
+    """Portfolio section data as templates render it, with each project's ``technologyList``.
+
+    Unshared, data is parsed and section items rendered lazily as the page
+    streams. ``shared`` sections serve several templates (the all-templates
+    bundle): data is parsed once, and ``markup`` renders each template's
+    section items once and keeps them, so templates with the same markup
+    (minimal-professional and tech-modern) reuse them, at the cost of holding
+    them in memory.
+    """
+
+    def __init__(self, portfolio: Dict, shared: bool = False):
+        projects = _SplitProjects(portfolio['projects'])
+        self.portfolio = {**portfolio, 'projects': list(projects) if shared else projects}
+        self.shared = shared
+        self._markup: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+
+    def markup(self, render: Callable[[Dict], Dict[str, Iterable[str]]]) -> Dict[str, Iterable[str]]:
+        if not self.shared:
+            return render(self.portfolio)
+        if render.__name__ not in self._markup:
+            self._markup[render.__name__] = {
+                section: tuple(items) for section, items in render(self.portfolio).items()
+            }
+        return self._markup[render.__name__]
+
+
+def _coalesce(chunks: Iterable[str], size: int = HTML_CHUNK_CHARS) -> Iterator[str]:
+    buffer, length = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _timed(chunks: Iterable[str], done: Callable[[float], None]) -> Iterator[str]:
+    # Only time spent producing chunks counts, not the consumer's time in between
+    chunks = iter(chunks)
+    elapsed = 0.0
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        elapsed += time.perf_counter() - start
+        if chunk is None:
+            break
+        yield chunk
+    done(elapsed)
+
+
+class RenderTimer:
+    """Render time of the page streams of one export.
+
+    Pages are rendered while the archive compresses them, so this is
+    subtracted from the archive write time to get the compression time.
+    """
+
+    def __init__(self):
+        # list.append is atomic; streams may be read on several compress threads
+        self._spans: List[float] = []
+
+    def add(self, seconds: float):
+        self._spans.append(seconds)
+
+    @property
+    def seconds(self) -> float:
+        return sum(self._spans)
+
+
+def _encoded(chunks: Iterable[str], template: Optional[str] = None) -> Iterator[bytes]:
+    """UTF-8 chunks; with a template, the total size is observed as its html output"""
+    size = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8')
+        size += len(data)
+        yield data
+    if template is not None:
+        output_bytes.observe(size, template=template, kind='html')
+
+
+class Stylesheet(NamedTuple):
+    filename: str
+    css: str
+    file: archive.File
+
+
+@lru_cache(maxsize=None)
+def stylesheet(template: str, minified: bool = False, fonts: Tuple[FontFace, ...] = ()) -> Stylesheet:
+    """A template's stylesheet, named by content hash and minified once per process"""
+    css = self_host_css(TEMPLATE_CSS.get(template, MINIMAL_PROFESSIONAL_CSS), fonts)
+    if minified:
+        css = minify_css(css) + '\n'
+    data = css.encode('utf-8')
+    filename = f'styles.{hashlib.sha256(data).hexdigest()[:12]}.css'
+    # Shared: archives compress it once per format and level, then reuse the bytes
+    return Stylesheet(filename, css, archive.File(filename, data, shared=True))
+
+
+@lru_cache(maxsize=None)
+def stylesheet_siblings(template: str, minified: bool = False, fonts: Tuple[FontFace, ...] = ()):
+    sheet = stylesheet(template, minified, fonts)
+    return archive.precompressed_siblings(sheet.filename, sheet.file.data, shared=True)
+
 
 class TemplateGenerator:
     """Generate static HTML portfolio templates"""
     
-    def generate_html(self, portfolio: Dict, template: str) -> str:
-        """Generate HTML based on template choice"""
+    def __init__(self, compress_workers: int = 1, font_cache_dir: Optional[str] = None):
+        # zlib and zstd release the GIL, so archive members compress in parallel
+        self._executor = (
+            ThreadPoolExecutor(compress_workers, thread_name_prefix='archive')
+            if compress_workers > 1 else None
+        )
+        self.font_cache = FontCache(font_cache_dir) if font_cache_dir else None
+        self._fingerprints: Dict[Tuple[str, ExportOptions], str] = {}
+    
+    def fingerprint(self, template: str, options: ExportOptions = ExportOptions()) -> str:
+        """Short hash of what a template exports, for artifact keys.
+
+        Computed from the uncompressed export of FINGERPRINT_PORTFOLIO, so it
+        changes whenever the template's markup, CSS, README or bundled fonts do,
+        and artifacts built by an older version stop matching.
+        """
+        key = (template, replace(options, format='zip', level=None))
+        if key not in self._fingerprints:
+            digest = hashlib.sha256()
+            for file in self.export_files(FINGERPRINT_PORTFOLIO, template, key[1]):
+                data = file.data if isinstance(file.data, bytes) else b''.join(file.data)
+                digest.update(f'{file.name}:{len(data)}:'.encode('utf-8'))
+                digest.update(data)
+            self._fingerprints[key] = digest.hexdigest()[:12]
+        return self._fingerprints[key]
+    
+    def font_faces(self, template: str, options: ExportOptions) -> Tuple[FontFace, ...]:
+        """Local fonts to bundle; empty keeps the remote import"""
+        if options.fonts != 'local' or self.font_cache is None:
+            return ()
+        return self.font_cache.faces(template)
+    
+    def generate_html(
+        self,
+        portfolio: Dict,
+        template: str,
+        stylesheet_href: Optional[str] = None,
+        minify: bool = False,
+        fonts: Tuple[FontFace, ...] = (),
+        sections: Optional[PortfolioSections] = None
+    ) -> str:
+        """Generate HTML based on template choice, linking stylesheet_href instead of inlining CSS if given"""
+        return ''.join(self.iter_html(portfolio, template, stylesheet_href, minify, fonts, sections))
+    
+    def iter_html(
+        self,
+        portfolio: Dict,
+        template: str,
+        stylesheet_href: Optional[str] = None,
+        minify: bool = False,
+        fonts: Tuple[FontFace, ...] = (),
+        sections: Optional[PortfolioSections] = None
+    ) -> Iterator[str]:
+        """generate_html as chunks, head to footer, rendered as they are consumed.
+
+        Sections are rendered an item at a time and emitted in chunks of about
+        HTML_CHUNK_CHARS, so memory stays flat however many items a portfolio has.
+        """
+        label = self._label(template)
+        return _timed(
+            self._iter_html(portfolio, template, stylesheet_href, minify, fonts, sections),
+            lambda seconds: render_duration.observe(seconds, template=label)
+        )
+    
+    def _iter_html(
+        self,
+        portfolio: Dict,
+        template: str,
+        stylesheet_href: Optional[str],
+        minify: bool,
+        fonts: Tuple[FontFace, ...],
+        sections: Optional[PortfolioSections]
+    ) -> Iterator[str]:
+        if stylesheet_href:
+            styles = f'<link rel="stylesheet" href="{stylesheet_href}">'
+        else:
+            styles = f'<style>\n{stylesheet(template, minify, fonts).css}</style>'
+        styles = preload_links(fonts) + styles
+        chunks = _coalesce(self._render(sections or PortfolioSections(portfolio), template, styles))
+        if minify:
+            chunks = minify_html_stream(chunks)
+        return chunks
+    
+    @staticmethod
+    def _label(template: str) -> str:
+        # Unknown names render as minimal-professional; keep metric labels bounded
+        return template if template in TEMPLATES else 'other'
+    
+    def _render(self, sections: PortfolioSections, template: str, styles: str) -> Iterator[str]:
         if template == 'minimal-professional':
-            return self._generate_minimal_professional(portfolio)
+            return self._generate_minimal_professional(sections, styles)
         elif template == 'creative-bold':
-            return self._generate_creative_bold(portfolio)
+            return self._generate_creative_bold(sections, styles)
         elif template == 'tech-modern':
-            return self._generate_tech_modern(portfolio)
+            return self._generate_tech_modern(sections, styles)
         else:
-            return self._generate_minimal_professional(portfolio)
+            return self._generate_minimal_professional(sections, styles)
     
-    def _generate_minimal_professional(self, p: Dict) -> str:
-        """Generate modern colorful professional template"""
-        skills_html = ''.join([f'<div class="skill-tag">{s["name"]}</div>' for s in p['skills']])
+    @staticmethod
+    def _minimal_professional_sections(p: Dict) -> Dict[str, Iterable[str]]:
+        skills_html = (f'<div class="skill-tag">{s["name"]}</div>' for s in p['skills'])
         
-        projects_html = ''.join([
+        projects_html = (
             f'''
             <div class="project-card">
                 <div class="project-number">0{i+1}</div>
                 <h3>{proj["title"]}</h3>
                 <p>{proj["description"]}</p>
-                {f'<div class="tech-tags">{", ".join([f"<span>{t.strip()}</span>" for t in proj["technologies"].split(",")])}</div>' if proj.get('technologies') else ''}
+                {f'<div class="tech-tags">{", ".join([f"<span>{t}</span>" for t in proj["technologyList"]])}</div>' if proj['technologyList'] else ''}
                 {f'<a href="{proj["link"]}" target="_blank" class="project-link">View Project →</a>' if proj.get('link') else ''}
             </div>
             '''
             for i, proj in enumerate(p['projects'])
-        ])
+        )
         
-        experience_html = ''.join([
+        experience_html = (
             f'''
             <div class="timeline-item">
                 <div class="timeline-dot"></div>
@@ -47,9 +348,9 @@ class TemplateGenerator:
             </div>
             '''
             for exp in p['experience']
-        ])
+        )
         
-        education_html = ''.join([
+        education_html = (
             f'''
             <div class="edu-card">
                 <div class="edu-icon">🎓</div>
@@ -62,524 +363,26 @@ class TemplateGenerator:
             </div>
             '''
             for edu in p['education']
-        ])
+        )
         
-        return f'''<!DOCTYPE html>
+        return {
+            'skills': skills_html,
+            'projects': projects_html,
+            'experience': experience_html,
+            'education': education_html,
+        }
+    
+    def _generate_minimal_professional(self, sections: PortfolioSections, styles: str) -> Iterator[str]:
+        """Generate modern colorful professional template"""
+        p = sections.portfolio
+        html = sections.markup(self._minimal_professional_sections)
+        yield f'''<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
 <title>{p['name']} - Portfolio</title>
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    * {{
-        margin: 0;
-        padding: 0;
-        box-sizing: border-box;
-    }}
-    
-    html {{
-        scroll-behavior: smooth;
-    }}
-    
-    body {{
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        line-height: 1.6;
-        color: #1a1a1a;
-        background: #0a0a0a;
-        overflow-x: hidden;
-    }}
-    
-    /* Navigation */
-    nav {{
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        z-index: 1000;
-        background: rgba(10, 10, 10, 0.95);
-        backdrop-filter: blur(10px);
-        border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-        padding: 1.5rem 0;
-    }}
-    
-    nav .container {{
-        max-width: 1400px;
-        margin: 0 auto;
-        padding: 0 3rem;
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }}
-    
-    nav .logo {{
-        font-size: 1.5rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }}
-    
-    nav ul {{
-        display: flex;
-        gap: 2rem;
-        list-style: none;
-    }}
-    
-    nav a {{
-        color: #fff;
-        text-decoration: none;
-        font-weight: 500;
-        font-size: 0.9rem;
-        transition: all 0.3s ease;
-        opacity: 0.8;
-    }}
-    
-    nav a:hover {{
-        opacity: 1;
-        transform: translateY(-2px);
-    }}
-    
-    /* Hero Section */
-    .hero {{
-        min-height: 100vh;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        background: linear-gradient(135deg, #0a0a0a 0%, #1a1a2e 100%);
-        position: relative;
-        overflow: hidden;
-        padding: 6rem 2rem;
-    }}
-    
-    .hero::before {{
-        content: '';
-        position: absolute;
-        top: -50%;
-        right: -50%;
-        width: 100%;
-        height: 100%;
-        background: radial-gradient(circle, rgba(102, 126, 234, 0.1) 0%, transparent 70%);
-        animation: pulse 8s ease-in-out infinite;
-    }}
-    
-    @keyframes pulse {{
-        0%, 100% {{ transform: scale(1); opacity: 0.5; }}
-        50% {{ transform: scale(1.2); opacity: 0.8; }}
-    }}
-    
-    .hero-content {{
-        text-align: center;
-        position: relative;
-        z-index: 1;
-    }}
-    
-    .hero h1 {{
-        font-size: 5rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        letter-spacing: -0.03em;
-        line-height: 1.1;
-        animation: fadeInUp 0.8s ease;
-    }}
-    
-    @keyframes fadeInUp {{
-        from {{ opacity: 0; transform: translateY(30px); }}
-        to {{ opacity: 1; transform: translateY(0); }}
-    }}
-    
-    .hero .title {{
-        font-size: 1.8rem;
-        color: rgba(255, 255, 255, 0.8);
-        font-weight: 400;
-        margin-bottom: 2rem;
-        animation: fadeInUp 0.8s ease 0.2s both;
-    }}
-    
-    .hero .contact {{
-        display: flex;
-        justify-content: center;
-        gap: 2rem;
-        font-size: 1rem;
-        color: rgba(255, 255, 255, 0.6);
-        animation: fadeInUp 0.8s ease 0.4s both;
-    }}
-    
-    .hero .contact a {{
-        color: rgba(255, 255, 255, 0.6);
-        text-decoration: none;
-        transition: all 0.3s ease;
-    }}
-    
-    .hero .contact a:hover {{
-        color: #667eea;
-    }}
-    
-    /* Section Styles */
-    section {{
-        padding: 8rem 3rem;
-        position: relative;
-    }}
-    
-    .container {{
-        max-width: 1400px;
-        margin: 0 auto;
-    }}
-    
-    section h2 {{
-        font-size: 3rem;
-        font-weight: 700;
-        margin-bottom: 4rem;
-        text-align: center;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }}
-    
-    /* About Section */
-    #about {{
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-    }}
-    
-    #about p {{
-        font-size: 1.3rem;
-        line-height: 1.8;
-        color: rgba(255, 255, 255, 0.8);
-        max-width: 900px;
-        margin: 0 auto;
-        text-align: center;
-    }}
-    
-    /* Skills Section */
-    #skills {{
-        background: #0a0a0a;
-    }}
-    
-    .skills-grid {{
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-        gap: 1.5rem;
-        max-width: 1000px;
-        margin: 0 auto;
-    }}
-    
-    .skill-tag {{
-        padding: 1.5rem;
-        background: linear-gradient(135deg, rgba(102, 126, 234, 0.1) 0%, rgba(118, 75, 162, 0.1) 100%);
-        border: 1px solid rgba(102, 126, 234, 0.3);
-        border-radius: 12px;
-        text-align: center;
-        font-weight: 500;
-        color: #fff;
-        transition: all 0.3s ease;
-        cursor: default;
-    }}
-    
-    .skill-tag:hover {{
-        transform: translateY(-5px);
-        border-color: #667eea;
-        box-shadow: 0 10px 30px rgba(102, 126, 234, 0.3);
-    }}
-    
-    /* Projects Section */
-    #projects {{
-        background: linear-gradient(135deg, #16213e 0%, #0f3460 100%);
-    }}
-    
-    .projects-grid {{
-        display: grid;
-        gap: 3rem;
-        max-width: 1000px;
-        margin: 0 auto;
-    }}
-    
-    .project-card {{
-        background: rgba(255, 255, 255, 0.03);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        border-radius: 20px;
-        padding: 3rem;
-        transition: all 0.4s ease;
-        position: relative;
-        overflow: hidden;
-    }}
-    
-    .project-card::before {{
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 4px;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        transform: scaleX(0);
-        transition: transform 0.4s ease;
-    }}
-    
-    .project-card:hover::before {{
-        transform: scaleX(1);
-    }}
-    
-    .project-card:hover {{
-        transform: translateY(-10px);
-        border-color: rgba(102, 126, 234, 0.5);
-        box-shadow: 0 20px 60px rgba(102, 126, 234, 0.2);
-    }}
-    
-    .project-number {{
-        font-size: 3rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-bottom: 1rem;
-    }}
-    
-    .project-card h3 {{
-        font-size: 1.8rem;
-        color: #fff;
-        margin-bottom: 1rem;
-    }}
-    
-    .project-card p {{
-        color: rgba(255, 255, 255, 0.7);
-        margin-bottom: 1.5rem;
-        line-height: 1.8;
-    }}
-    
-    .tech-tags {{
-        display: flex;
-        flex-wrap: wrap;
-        gap: 0.5rem;
-        margin-bottom: 1.5rem;
-    }}
-    
-    .tech-tags span {{
-        padding: 0.5rem 1rem;
-        background: rgba(102, 126, 234, 0.2);
-        border-radius: 20px;
-        font-size: 0.85rem;
-        color: #667eea;
-    }}
-    
-    .project-link {{
-        display: inline-block;
-        color: #667eea;
-        text-decoration: none;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }}
-    
-    .project-link:hover {{
-        transform: translateX(5px);
-    }}
-    
-    /* Experience Section */
-    #experience {{
-        background: #0a0a0a;
-    }}
-    
-    .timeline {{
-        max-width: 900px;
-        margin: 0 auto;
-        position: relative;
-    }}
-    
-    .timeline::before {{
-        content: '';
-        position: absolute;
-        left: 20px;
-        top: 0;
-        bottom: 0;
-        width: 2px;
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-    }}
-    
-    .timeline-item {{
-        position: relative;
-        padding-left: 60px;
-        margin-bottom: 4rem;
-    }}
-    
-    .timeline-dot {{
-        position: absolute;
-        left: 10px;
-        top: 0;
-        width: 20px;
-        height: 20px;
-        background: #667eea;
-        border: 4px solid #0a0a0a;
-        border-radius: 50%;
-    }}
-    
-    .timeline-content {{
-        background: rgba(255, 255, 255, 0.03);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        border-radius: 15px;
-        padding: 2rem;
-        transition: all 0.3s ease;
-    }}
-    
-    .timeline-content:hover {{
-        transform: translateX(10px);
-        border-color: rgba(102, 126, 234, 0.5);
-    }}
-    
-    .timeline-content .duration {{
-        display: inline-block;
-        padding: 0.5rem 1rem;
-        background: rgba(102, 126, 234, 0.2);
-        border-radius: 20px;
-        font-size: 0.85rem;
-        color: #667eea;
-        margin-bottom: 1rem;
-    }}
-    
-    .timeline-content h3 {{
-        font-size: 1.5rem;
-        color: #fff;
-        margin-bottom: 0.5rem;
-    }}
-    
-    .timeline-content h4 {{
-        font-size: 1.1rem;
-        color: rgba(255, 255, 255, 0.6);
-        font-weight: 500;
-        margin-bottom: 1rem;
-    }}
-    
-    .timeline-content p {{
-        color: rgba(255, 255, 255, 0.7);
-        line-height: 1.8;
-    }}
-    
-    /* Education Section */
-    #education {{
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-    }}
-    
-    .edu-grid {{
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-        gap: 2rem;
-        max-width: 1000px;
-        margin: 0 auto;
-    }}
-    
-    .edu-card {{
-        background: rgba(255, 255, 255, 0.03);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        border-radius: 20px;
-        padding: 2.5rem;
-        transition: all 0.3s ease;
-        display: flex;
-        gap: 1.5rem;
-    }}
-    
-    .edu-card:hover {{
-        transform: translateY(-5px);
-        border-color: rgba(102, 126, 234, 0.5);
-        box-shadow: 0 15px 40px rgba(102, 126, 234, 0.2);
-    }}
-    
-    .edu-icon {{
-        font-size: 3rem;
-        flex-shrink: 0;
-    }}
-    
-    .edu-content h3 {{
-        font-size: 1.3rem;
-        color: #fff;
-        margin-bottom: 0.5rem;
-    }}
-    
-    .edu-content h4 {{
-        font-size: 1rem;
-        color: rgba(255, 255, 255, 0.6);
-        font-weight: 500;
-        margin-bottom: 0.5rem;
-    }}
-    
-    .edu-content .year {{
-        display: inline-block;
-        padding: 0.3rem 0.8rem;
-        background: rgba(102, 126, 234, 0.2);
-        border-radius: 15px;
-        font-size: 0.85rem;
-        color: #667eea;
-        margin-bottom: 1rem;
-    }}
-    
-    .edu-content p {{
-        color: rgba(255, 255, 255, 0.7);
-        font-size: 0.95rem;
-        line-height: 1.6;
-    }}
-    
-    /* Footer */
-    footer {{
-        background: #0a0a0a;
-        text-align: center;
-        padding: 3rem 2rem;
-        border-top: 1px solid rgba(255, 255, 255, 0.1);
-    }}
-    
-    footer p {{
-        color: rgba(255, 255, 255, 0.5);
-        font-size: 0.95rem;
-    }}
-    
-    /* Responsive */
-    @media (max-width: 768px) {{
-        nav .container {{
-            padding: 0 1.5rem;
-        }}
-        
-        nav ul {{
-            gap: 1rem;
-        }}
-        
-        .hero h1 {{
-            font-size: 3rem;
-        }}
-        
-        .hero .title {{
-            font-size: 1.3rem;
-        }}
-        
-        .hero .contact {{
-            flex-direction: column;
-            gap: 0.5rem;
-        }}
-        
-        section {{
-            padding: 5rem 1.5rem;
-        }}
-        
-        section h2 {{
-            font-size: 2rem;
-        }}
-        
-        .edu-grid {{
-            grid-template-columns: 1fr;
-        }}
-        
-        .timeline::before {{
-            left: 15px;
-        }}
-        
-        .timeline-dot {{
-            left: 5px;
-        }}
-    }}
-</style>
+{styles}
 </head>
 <body>
 <!-- Navigation -->
@@ -620,7 +423,9 @@ class TemplateGenerator:
 <div class="container">
 <h2>Skills & Expertise</h2>
 <div class="skills-grid">
-{skills_html}
+'''
+        yield from html['skills']
+        yield '''
 </div>
 </div>
 </section>
@@ -629,7 +434,9 @@ class TemplateGenerator:
 <div class="container">
 <h2>Featured Projects</h2>
 <div class="projects-grid">
-{projects_html}
+'''
+        yield from html['projects']
+        yield '''
 </div>
 </div>
 </section>
@@ -638,7 +445,9 @@ class TemplateGenerator:
 <div class="container">
 <h2>Work Experience</h2>
 <div class="timeline">
-{experience_html}
+'''
+        yield from html['experience']
+        yield '''
 </div>
 </div>
 </section>
@@ -647,7 +456,9 @@ class TemplateGenerator:
 <div class="container">
 <h2>Education</h2>
 <div class="edu-grid">
-{education_html}
+'''
+        yield from html['education']
+        yield f'''
 </div>
 </div>
 </section>
@@ -658,24 +469,24 @@ class TemplateGenerator:
 </body>
 </html>'''
     
-    def _generate_creative_bold(self, p: Dict) -> str:
-        """Generate creative bold template with vibrant colors"""
-        skills_html = ''.join([f'<div class="skill-tag">{s["name"]}</div>' for s in p['skills']])
+    @staticmethod
+    def _creative_bold_sections(p: Dict) -> Dict[str, Iterable[str]]:
+        skills_html = (f'<div class="skill-tag">{s["name"]}</div>' for s in p['skills'])
         
-        projects_html = ''.join([
+        projects_html = (
             f'''
             <div class="project-card">
                 <div class="project-glow"></div>
                 <h3>{proj["title"]}</h3>
                 <p>{proj["description"]}</p>
-                {f'<div class="tech-tags">{", ".join([f"<span>{t.strip()}</span>" for t in proj["technologies"].split(",")])}</div>' if proj.get('technologies') else ''}
+                {f'<div class="tech-tags">{", ".join([f"<span>{t}</span>" for t in proj["technologyList"]])}</div>' if proj['technologyList'] else ''}
                 {f'<a href="{proj["link"]}" target="_blank" class="project-link">Explore →</a>' if proj.get('link') else ''}
             </div>
             '''
             for proj in p['projects']
-        ])
+        )
         
-        experience_html = ''.join([
+        experience_html = (
             f'''
             <div class="exp-card">
                 <span class="duration">{exp["duration"]}</span>
@@ -685,9 +496,9 @@ class TemplateGenerator:
             </div>
             '''
             for exp in p['experience']
-        ])
+        )
         
-        education_html = ''.join([
+        education_html = (
             f'''
             <div class="edu-card">
                 <div class="edu-glow"></div>
@@ -698,443 +509,26 @@ class TemplateGenerator:
             </div>
             '''
             for edu in p['education']
-        ])
+        )
         
-        return f'''<!DOCTYPE html>
+        return {
+            'skills': skills_html,
+            'projects': projects_html,
+            'experience': experience_html,
+            'education': education_html,
+        }
+    
+    def _generate_creative_bold(self, sections: PortfolioSections, styles: str) -> Iterator[str]:
+        """Generate creative bold template with vibrant colors"""
+        p = sections.portfolio
+        html = sections.markup(self._creative_bold_sections)
+        yield f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{p['name']} - Creative Portfolio</title>
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700;800&display=swap');
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        html {{
-            scroll-behavior: smooth;
-        }}
-        
-        body {{
-            font-family: 'Poppins', sans-serif;
-            background: #050505;
-            color: #fff;
-            overflow-x: hidden;
-        }}
-        
-        /* Hero Section */
-        .hero {{
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-            position: relative;
-            overflow: hidden;
-        }}
-        
-        .hero::before {{
-            content: '';
-            position: absolute;
-            width: 200%;
-            height: 200%;
-            background: radial-gradient(circle, rgba(255,255,255,0.1) 1px, transparent 1px);
-            background-size: 50px 50px;
-            animation: moveGrid 20s linear infinite;
-        }}
-        
-        @keyframes moveGrid {{
-            0% {{ transform: translate(0, 0); }}
-            100% {{ transform: translate(50px, 50px); }}
-        }}
-        
-        .hero-content {{
-            position: relative;
-            z-index: 1;
-            text-align: center;
-            padding: 3rem;
-        }}
-        
-        .hero h1 {{
-            font-size: 6rem;
-            font-weight: 800;
-            margin-bottom: 1rem;
-            text-shadow: 0 0 40px rgba(0,0,0,0.3);
-            animation: glowText 3s ease-in-out infinite;
-        }}
-        
-        @keyframes glowText {{
-            0%, 100% {{ text-shadow: 0 0 40px rgba(0,0,0,0.3); }}
-            50% {{ text-shadow: 0 0 60px rgba(255,255,255,0.5); }}
-        }}
-        
-        .hero .title {{
-            font-size: 2rem;
-            font-weight: 500;
-            opacity: 0.95;
-            margin-bottom: 2rem;
-        }}
-        
-        .hero .contact {{
-            display: flex;
-            justify-content: center;
-            gap: 2rem;
-            font-size: 1.1rem;
-        }}
-        
-        .hero .contact a {{
-            color: #fff;
-            text-decoration: none;
-            padding: 0.8rem 2rem;
-            background: rgba(255,255,255,0.2);
-            border-radius: 50px;
-            backdrop-filter: blur(10px);
-            transition: all 0.3s ease;
-        }}
-        
-        .hero .contact a:hover {{
-            background: rgba(255,255,255,0.3);
-            transform: translateY(-3px);
-        }}
-        
-        /* Sections */
-        section {{
-            padding: 8rem 3rem;
-            position: relative;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-        }}
-        
-        section h2 {{
-            font-size: 4rem;
-            font-weight: 800;
-            margin-bottom: 4rem;
-            text-align: center;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-        
-        /* About Section */
-        #about {{
-            background: linear-gradient(135deg, #1a1a1a 0%, #2d1b69 100%);
-        }}
-        
-        #about p {{
-            font-size: 1.5rem;
-            line-height: 1.9;
-            color: rgba(255,255,255,0.85);
-            max-width: 900px;
-            margin: 0 auto;
-            text-align: center;
-        }}
-        
-        /* Skills Section */
-        #skills {{
-            background: #050505;
-        }}
-        
-        .skills-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-            gap: 2rem;
-            max-width: 1000px;
-            margin: 0 auto;
-        }}
-        
-        .skill-tag {{
-            padding: 2rem;
-            background: linear-gradient(135deg, rgba(102, 126, 234, 0.2) 0%, rgba(240, 147, 251, 0.2) 100%);
-            border: 2px solid transparent;
-            border-radius: 20px;
-            text-align: center;
-            font-weight: 600;
-            font-size: 1.1rem;
-            transition: all 0.4s ease;
-            position: relative;
-            overflow: hidden;
-        }}
-        
-        .skill-tag::before {{
-            content: '';
-            position: absolute;
-            top: -50%;
-            left: -50%;
-            width: 200%;
-            height: 200%;
-            background: linear-gradient(45deg, transparent, rgba(255,255,255,0.1), transparent);
-            transform: rotate(45deg);
-            transition: all 0.5s ease;
-        }}
-        
-        .skill-tag:hover::before {{
-            left: 100%;
-        }}
-        
-        .skill-tag:hover {{
-            transform: translateY(-10px) scale(1.05);
-            border-color: #f093fb;
-            box-shadow: 0 20px 60px rgba(240, 147, 251, 0.4);
-        }}
-        
-        /* Projects Section */
-        #projects {{
-            background: linear-gradient(135deg, #0f0c29 0%, #302b63 50%, #24243e 100%);
-        }}
-        
-        .projects-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            gap: 3rem;
-        }}
-        
-        .project-card {{
-            background: rgba(255,255,255,0.05);
-            border-radius: 25px;
-            padding: 3rem;
-            position: relative;
-            overflow: hidden;
-            transition: all 0.4s ease;
-        }}
-        
-        .project-glow {{
-            position: absolute;
-            top: -50%;
-            right: -50%;
-            width: 200px;
-            height: 200px;
-            background: radial-gradient(circle, rgba(102, 126, 234, 0.4) 0%, transparent 70%);
-            transition: all 0.4s ease;
-        }}
-        
-        .project-card:hover .project-glow {{
-            top: -30%;
-            right: -30%;
-            width: 300px;
-            height: 300px;
-        }}
-        
-        .project-card:hover {{
-            transform: translateY(-15px);
-            box-shadow: 0 30px 80px rgba(102, 126, 234, 0.3);
-        }}
-        
-        .project-card h3 {{
-            font-size: 2rem;
-            margin-bottom: 1rem;
-            position: relative;
-            z-index: 1;
-        }}
-        
-        .project-card p {{
-            color: rgba(255,255,255,0.8);
-            margin-bottom: 1.5rem;
-            line-height: 1.8;
-            position: relative;
-            z-index: 1;
-        }}
-        
-        .tech-tags {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 0.8rem;
-            margin-bottom: 1.5rem;
-            position: relative;
-            z-index: 1;
-        }}
-        
-        .tech-tags span {{
-            padding: 0.6rem 1.2rem;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 25px;
-            font-size: 0.9rem;
-            font-weight: 600;
-        }}
-        
-        .project-link {{
-            display: inline-block;
-            color: #f093fb;
-            text-decoration: none;
-            font-weight: 700;
-            font-size: 1.1rem;
-            position: relative;
-            z-index: 1;
-            transition: all 0.3s ease;
-        }}
-        
-        .project-link:hover {{
-            transform: translateX(10px);
-        }}
-        
-        /* Experience Section */
-        #experience {{
-            background: #050505;
-        }}
-        
-        .exp-grid {{
-            display: grid;
-            gap: 2.5rem;
-            max-width: 1000px;
-            margin: 0 auto;
-        }}
-        
-        .exp-card {{
-            background: linear-gradient(135deg, rgba(102, 126, 234, 0.1) 0%, rgba(240, 147, 251, 0.1) 100%);
-            border-left: 5px solid #667eea;
-            border-radius: 20px;
-            padding: 3rem;
-            transition: all 0.3s ease;
-        }}
-        
-        .exp-card:hover {{
-            transform: translateX(15px);
-            border-left-color: #f093fb;
-        }}
-        
-        .exp-card .duration {{
-            display: inline-block;
-            padding: 0.6rem 1.5rem;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 30px;
-            font-size: 0.9rem;
-            font-weight: 600;
-            margin-bottom: 1.5rem;
-        }}
-        
-        .exp-card h3 {{
-            font-size: 2rem;
-            margin-bottom: 0.5rem;
-        }}
-        
-        .exp-card h4 {{
-            font-size: 1.3rem;
-            color: rgba(255,255,255,0.7);
-            font-weight: 500;
-            margin-bottom: 1.5rem;
-        }}
-        
-        .exp-card p {{
-            color: rgba(255,255,255,0.8);
-            line-height: 1.8;
-        }}
-        
-        /* Education Section */
-        #education {{
-            background: linear-gradient(135deg, #1a1a1a 0%, #2d1b69 100%);
-        }}
-        
-        .edu-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-            gap: 3rem;
-        }}
-        
-        .edu-card {{
-            background: rgba(255,255,255,0.05);
-            border-radius: 25px;
-            padding: 3rem;
-            position: relative;
-            overflow: hidden;
-            transition: all 0.4s ease;
-        }}
-        
-        .edu-glow {{
-            position: absolute;
-            bottom: -50%;
-            left: -50%;
-            width: 200px;
-            height: 200px;
-            background: radial-gradient(circle, rgba(240, 147, 251, 0.3) 0%, transparent 70%);
-            transition: all 0.4s ease;
-        }}
-        
-        .edu-card:hover .edu-glow {{
-            bottom: -30%;
-            left: -30%;
-            width: 300px;
-            height: 300px;
-        }}
-        
-        .edu-card:hover {{
-            transform: translateY(-10px);
-            box-shadow: 0 25px 70px rgba(240, 147, 251, 0.3);
-        }}
-        
-        .edu-card h3 {{
-            font-size: 1.8rem;
-            margin-bottom: 0.8rem;
-            position: relative;
-            z-index: 1;
-        }}
-        
-        .edu-card h4 {{
-            font-size: 1.2rem;
-            color: rgba(255,255,255,0.7);
-            font-weight: 500;
-            margin-bottom: 1rem;
-            position: relative;
-            z-index: 1;
-        }}
-        
-        .edu-card .year {{
-            display: inline-block;
-            padding: 0.5rem 1.2rem;
-            background: linear-gradient(135deg, #667eea 0%, #f093fb 100%);
-            border-radius: 25px;
-            font-size: 0.9rem;
-            font-weight: 600;
-            margin-bottom: 1.5rem;
-            position: relative;
-            z-index: 1;
-        }}
-        
-        .edu-card p {{
-            color: rgba(255,255,255,0.75);
-            line-height: 1.7;
-            position: relative;
-            z-index: 1;
-        }}
-        
-        /* Footer */
-        footer {{
-            background: #000;
-            text-align: center;
-            padding: 4rem 2rem;
-        }}
-        
-        footer p {{
-            color: rgba(255,255,255,0.6);
-            font-size: 1rem;
-        }}
-        
-        /* Responsive */
-        @media (max-width: 768px) {{
-            .hero h1 {{
-                font-size: 3.5rem;
-            }}
-            
-            section {{
-                padding: 5rem 1.5rem;
-            }}
-            
-            section h2 {{
-                font-size: 2.5rem;
-            }}
-            
-            .projects-grid,
-            .edu-grid {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-    </style>
+    {styles}
 </head>
 <body>
     <!-- Hero Section -->
@@ -1162,7 +556,9 @@ class TemplateGenerator:
         <div class="container">
             <h2>Skills</h2>
             <div class="skills-grid">
-                {skills_html}
+                '''
+        yield from html['skills']
+        yield '''
             </div>
         </div>
     </section>
@@ -1172,7 +568,9 @@ class TemplateGenerator:
         <div class="container">
             <h2>Projects</h2>
             <div class="projects-grid">
-                {projects_html}
+                '''
+        yield from html['projects']
+        yield '''
             </div>
         </div>
     </section>
@@ -1182,7 +580,9 @@ class TemplateGenerator:
         <div class="container">
             <h2>Experience</h2>
             <div class="exp-grid">
-                {experience_html}
+                '''
+        yield from html['experience']
+        yield '''
             </div>
         </div>
     </section>
@@ -1192,7 +592,9 @@ class TemplateGenerator:
         <div class="container">
             <h2>Education</h2>
             <div class="edu-grid">
-                {education_html}
+                '''
+        yield from html['education']
+        yield f'''
             </div>
         </div>
     </section>
@@ -1204,28 +606,92 @@ class TemplateGenerator:
 </body>
 </html>'''
     
-    def _generate_tech_modern(self, p: Dict) -> str:
+    def _generate_tech_modern(self, sections: PortfolioSections, styles: str) -> Iterator[str]:
         """Generate tech modern template"""
-        # Similar structure but with tech-focused styling
-        return self._generate_minimal_professional(p).replace(
-            'font-family: -apple-system',
-            'font-family: "SF Mono", "Monaco", "Inconsolata", "Roboto Mono"'
-        )
-    
-    def generate_zip(self, portfolio: Dict, template: str) -> bytes:
+        # Same markup as minimal-professional; the styling differs (see TEMPLATE_CSS)
+        return self._generate_minimal_professional(sections, styles)
+    
+    def generate_zip(
+        self,
+        portfolio: Dict,
+        template: str,
+        deterministic: bool = True,
+        options: ExportOptions = ExportOptions()
+    ) -> bytes:
         """Generate ZIP file with portfolio HTML"""
-        html_content = self.generate_html(portfolio, template)
+        return self.generate_archive(portfolio, template, deterministic, replace(options, format='zip'))
+    
+    def generate_archive(
+        self,
+        portfolio: Dict,
+        template: str,
+        deterministic: bool = True,
+        options: ExportOptions = ExportOptions()
+    ) -> bytes:
+        """Generate an archive (format per options) with the portfolio site.
+
+        In deterministic mode (the default) entries are written in sorted order
+        with fixed timestamps, permissions and compression level, so the same
+        portfolio and template always produce the same bytes and digest. The
+        ``multi`` layout links ``styles.<hash>.css``, whose compressed bytes are
+        shared by every archive for the template.
+        """
+        render_timer = RenderTimer()
+        files = self.export_files(portfolio, template, options, render_timer=render_timer)
+        start = time.perf_counter()
+        archive_bytes = archive.write_archive(
+            files, options.format, options.level, None if deterministic else time.time(), self._executor
+        )
+        # Pages render as they are compressed; parallel renders can add up to more than wall time
+        seconds = max(0.0, time.perf_counter() - start - render_timer.seconds)
+        label = 'bundle' if options.bundle else self._label(template)
+        compress_duration.observe(seconds, template=label)
+        output_bytes.observe(len(archive_bytes), template=label, kind=options.format)
+        return archive_bytes
+    
+    def export_files(
+        self,
+        portfolio: Dict,
+        template: str,
+        options: ExportOptions = ExportOptions(),
+        sections: Optional[PortfolioSections] = None,
+        render_timer: Optional[RenderTimer] = None
+    ) -> List[archive.File]:
+        """The files of an export (site, README and any precompressed siblings), uncompressed.
+
+        ``index.html`` and its siblings are streams rendered as the archive
+        reads them, so the list can be written once. Only the ``index.html``
+        render is observed as render_duration; ``render_timer`` collects them all.
+        """
+        if options.bundle:
+            return self.bundle_files(portfolio, replace(options, bundle=False), render_timer)
+        fonts = self.font_faces(template, options)
+        sheet = stylesheet(template, options.minify, fonts) if options.layout == 'multi' else None
+        sections = sections or PortfolioSections(portfolio)
+        label = self._label(template)
+        
+        def page(observe: bool = False) -> Iterator[str]:
+            # Rendered lazily while the archive compresses it, never whole
+            def done(seconds: float):
+                if observe:
+                    render_duration.observe(seconds, template=label)
+                if render_timer is not None:
+                    render_timer.add(seconds)
+            chunks = self._iter_html(
+                portfolio, template, sheet.filename if sheet else None, options.minify, fonts, sections
+            )
+            return _timed(chunks, done)
         
         # Create README
         readme = f'''# {portfolio['name']} - Portfolio Website
 
-This is your generated portfolio website. It's a single HTML file that's ready to deploy!
+This is your generated portfolio website. {'It is an HTML page and its stylesheet' if sheet else 'It is a single HTML file'}, ready to deploy!
 
 ## Deployment Options
 
 ### GitHub Pages
 1. Create a new repository on GitHub
-2. Upload `index.html` to the repository
+2. Upload {'the files in this folder' if sheet else '`index.html`'} to the repository
 3. Go to Settings > Pages
 4. Select "main" branch and save
 5. Your site will be live at `https://yourusername.github.io/repository-name`
@@ -1247,11 +713,40 @@ You can edit the HTML file directly to customize colors, fonts, and layout.
 Generated with PortfolioAI
 '''
         
-        # Create ZIP in memory
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            zip_file.writestr('index.html', html_content)
-            zip_file.writestr('README.md', readme)
-        
-        zip_buffer.seek(0)
-        return zip_buffer.getvalue()
\ No newline at end of file
+        files = [
+            archive.File('index.html', _encoded(page(observe=True), label)),
+            archive.File('README.md', readme.encode('utf-8')),
+        ]
+        if options.precompress:
+            # Each sibling renders the page again rather than keeping it in memory
+            files.extend(archive.precompressed_stream_siblings(
+                'index.html', lambda: _encoded(page()), PAGE_BROTLI_QUALITY
+            ))
+        if sheet:
+            files.append(sheet.file)
+            if options.precompress:
+                files.extend(stylesheet_siblings(template, options.minify, fonts))
+        # WOFF2 is already compressed; weights served by one variable font share a file
+        unique_fonts = {face.path: face.data for face in fonts}
+        files.extend(
+            archive.File(path, data, compressible=False, shared=True) for path, data in unique_fonts.items()
+        )
+        return files
+    
+    def bundle_files(
+        self,
+        portfolio: Dict,
+        options: ExportOptions = ExportOptions(),
+        render_timer: Optional[RenderTimer] = None
+    ) -> List[archive.File]:
+        """Every template's export under a folder named after the template.
+
+        Section data is parsed once and section markup rendered once per
+        distinct template markup, rather than once per template.
+        """
+        sections = PortfolioSections(portfolio, shared=True)
+        return [
+            file._replace(name=f'{template}/{file.name}')
+            for template in TEMPLATES
+            for file in self.export_files(portfolio, template, options, sections, render_timer)
+        ]
@@ -0,0 +1,122 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import admission  # noqa: E402
+from admission import AdmissionMiddleware, InMemoryRateLimitBackend, RouteClassLimits  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_app(limits: RouteClassLimits, release: asyncio.Event = None, **options):
+    async def render(request):
+        if release is not None:
+            await release.wait()
+        return PlainTextResponse('ok')
+
+    async def free(request):
+        return PlainTextResponse('ok')
+
+    app = Starlette(routes=[Route('/render', render), Route('/free', free)])
+    app.add_middleware(
+        AdmissionMiddleware,
+        routes={'/render': 'render'},
+        limits={'render': limits},
+        backend=InMemoryRateLimitBackend(),
+        **options
+    )
+    return app
+
+
+def client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test')
+
+
+def test_in_memory_bucket_spends_and_refills(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission.time, 'monotonic', clock)
+    backend = InMemoryRateLimitBackend()
+
+    async def run():
+        assert await backend.acquire('a', rate=0.5, burst=2) == 0
+        assert await backend.acquire('a', rate=0.5, burst=2) == 0
+        assert await backend.acquire('a', rate=0.5, burst=2) == 2.0
+        # Other clients have their own bucket
+        assert await backend.acquire('b', rate=0.5, burst=2) == 0
+        clock.now += 1
+        assert await backend.acquire('a', rate=0.5, burst=2) == 1.0
+        clock.now += 1
+        assert await backend.acquire('a', rate=0.5, burst=2) == 0
+        # Refills never exceed the burst
+        clock.now += 3600
+        assert [await backend.acquire('a', rate=0.5, burst=2) for _ in range(3)][-1] > 0
+
+    asyncio.run(run())
+
+
+def test_empty_bucket_gets_429_with_retry_after():
+    app = make_app(RouteClassLimits(rate=0.25, burst=2, concurrency=4))
+
+    async def run():
+        async with client(app) as http:
+            statuses = [(await http.get('/render')).status_code for _ in range(2)]
+            rejected = await http.get('/render')
+            unlimited = await http.get('/free')
+        return statuses, rejected, unlimited
+
+    statuses, rejected, unlimited = asyncio.run(run())
+    assert statuses == [200, 200]
+    assert rejected.status_code == 429
+    assert rejected.headers['retry-after'] == '4'
+    assert unlimited.status_code == 200
+
+
+def test_saturated_route_class_gets_503_with_retry_after():
+    async def run():
+        release = asyncio.Event()
+        app = make_app(RouteClassLimits(rate=100, burst=100, concurrency=1, queue_timeout=0.05), release)
+        async with client(app) as http:
+            running = asyncio.ensure_future(http.get('/render'))
+            await asyncio.sleep(0.01)
+            rejected = await http.get('/render')
+            release.set()
+            return (await running), rejected
+
+    admitted, rejected = asyncio.run(run())
+    assert admitted.status_code == 200
+    assert rejected.status_code == 503
+    assert rejected.headers['retry-after'] == '1'
+
+
+def test_forwarded_client_is_taken_from_the_trusted_proxy_entry():
+    app = make_app(
+        RouteClassLimits(rate=0.01, burst=1, concurrency=4),
+        client_header='X-Forwarded-For',
+        trusted_proxies=2
+    )
+
+    async def run():
+        async with client(app) as http:
+            # Spoofed leftmost entries must not buy a fresh bucket
+            first = await http.get('/render', headers={'X-Forwarded-For': 'spoof-1, 203.0.113.7, 10.0.0.2'})
+            second = await http.get('/render', headers={'X-Forwarded-For': 'spoof-2, 203.0.113.7, 10.0.0.2'})
+            other = await http.get('/render', headers={'X-Forwarded-For': '198.51.100.4, 10.0.0.2'})
+        return first, second, other
+
+    first, second, other = asyncio.run(run())
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert other.status_code == 200
@@ -0,0 +1,160 @@
+import gzip
+import io
+import random
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import archive  # noqa: E402
+from archive import (  # noqa: E402
+    TAR_MTIME, ZIP_TIMESTAMP, ArchiveWriter, File, check_format, precompressed_siblings,
+    precompressed_stream_siblings, write_archive
+)
+
+PAGE = ''.join(f'<div class="item">Project {i} – résumé</div>\n' for i in range(3000)).encode('utf-8')
+# Compressible, so a recompressed copy would not contain these bytes verbatim
+FONT = b'wOF2' + b'glyph outline ' * 2000
+LONG_NAME = 'assets/' + 'nested/' * 20 + 'site.css'
+
+FORMATS = [
+    pytest.param('zip', 0, id='zip-0'),
+    pytest.param('zip', 9, id='zip-9'),
+    pytest.param('tar.gz', 0, id='tar.gz-0'),
+    pytest.param('tar.gz', 6, id='tar.gz-6'),
+    pytest.param('tar.zst', 1, id='tar.zst-1'),
+    pytest.param('tar.zst', 19, id='tar.zst-19'),
+]
+
+
+def chunks(data: bytes, size: int = 4096):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+def sample_files(streamed: bool = False):
+    return [
+        File('index.html', chunks(PAGE) if streamed else PAGE),
+        File('README.md', b'# Portfolio\n'),
+        File('empty.txt', b''),
+        File('über/straße.txt', 'grüße'.encode('utf-8')),
+        File(LONG_NAME, b'body { margin: 0 }\n' * 100, shared=True),
+        File('fonts/inter.woff2', FONT, compressible=False, shared=True),
+    ]
+
+
+def read_members(data: bytes, fmt: str) -> dict:
+    if fmt == 'zip':
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert zf.testzip() is None
+            for info in zf.infolist():
+                assert info.date_time == ZIP_TIMESTAMP
+            return {info.filename: zf.read(info) for info in zf.infolist()}
+    if fmt == 'tar.gz':
+        raw = gzip.decompress(data)
+    else:
+        zstandard = pytest.importorskip('zstandard')
+        raw = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True).read()
+    with tarfile.open(fileobj=io.BytesIO(raw)) as tf:
+        members = {}
+        for info in tf.getmembers():
+            assert info.isfile() and info.mode == 0o644 and info.mtime == TAR_MTIME
+            members[info.name] = tf.extractfile(info).read()
+        return members
+
+
+def expected(files) -> dict:
+    return {file.name: file.data if isinstance(file.data, bytes) else b''.join(file.data) for file in files}
+
+
+@pytest.mark.parametrize('fmt, level', FORMATS)
+def test_members_round_trip(fmt, level):
+    if fmt not in archive.available_formats():
+        pytest.skip(f'{fmt} is not available')
+    data = write_archive(sample_files(), fmt, level)
+    members = read_members(data, fmt)
+    assert members == expected(sample_files())
+    assert list(members) == sorted(members)
+
+
+@pytest.mark.parametrize('fmt, level', FORMATS)
+def test_streamed_members_round_trip(fmt, level):
+    if fmt not in archive.available_formats():
+        pytest.skip(f'{fmt} is not available')
+    data = write_archive(sample_files(streamed=True), fmt, level)
+    assert read_members(data, fmt) == expected(sample_files())
+    if fmt == 'zip':
+        # Deflate output does not depend on how the input is chunked
+        assert data == write_archive(sample_files(), fmt, level)
+
+
+def test_zip_level_0_stores_every_member():
+    with zipfile.ZipFile(io.BytesIO(write_archive(sample_files(), 'zip', 0))) as zf:
+        for info in zf.infolist():
+            assert info.compress_type == zipfile.ZIP_STORED
+            assert info.compress_size == info.file_size
+
+
+@pytest.mark.parametrize('fmt', ['zip', 'tar.gz', 'tar.zst'])
+def test_precompressed_and_font_members_are_not_recompressed(fmt):
+    if fmt not in archive.available_formats():
+        pytest.skip(f'{fmt} is not available')
+    siblings = precompressed_siblings('index.html', PAGE, brotli_quality=5)
+    files = [*siblings, File('fonts/inter.woff2', FONT, compressible=False, shared=True)]
+    data = write_archive(files, fmt, archive.ARCHIVE_FORMATS[fmt].max_level)
+    assert read_members(data, fmt) == expected(files)
+    if fmt == 'zip':
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert {info.compress_type for info in zf.infolist()} == {zipfile.ZIP_STORED}
+    if fmt != 'tar.zst':
+        # Stored (deflate level 0 inside tar.gz), so the bytes appear verbatim.
+        # zstd has no stored mode; such members get a cheap level 1 frame instead
+        for file in files:
+            assert file.data in data
+
+
+def test_stream_siblings_match_byte_siblings():
+    streamed = precompressed_stream_siblings('index.html', lambda: chunks(PAGE))
+    eager = precompressed_siblings('index.html', PAGE)
+    assert [file.name for file in streamed] == [file.name for file in eager]
+    assert b''.join(streamed[0].data) == eager[0].data
+    assert gzip.decompress(eager[0].data) == PAGE
+    if archive.brotli is not None:
+        assert archive.brotli.decompress(b''.join(streamed[1].data)) == PAGE
+
+
+@pytest.mark.parametrize('fmt', ['zip', 'tar.gz', 'tar.zst'])
+def test_incremental_writes_make_one_archive(fmt):
+    if fmt not in archive.available_formats():
+        pytest.skip(f'{fmt} is not available')
+    writer = ArchiveWriter(fmt)
+    files = sample_files(streamed=True)
+    data = writer.write(writer.prepare(files[:2])) + writer.write(writer.prepare(files[2:])) + writer.finish()
+    assert read_members(data, fmt) == expected(sample_files())
+
+
+def test_zip_marks_non_ascii_names_as_utf8():
+    with zipfile.ZipFile(io.BytesIO(write_archive(sample_files(), 'zip'))) as zf:
+        flags = {info.filename: info.flag_bits & 0x800 for info in zf.infolist()}
+    assert flags['über/straße.txt'] and not flags['index.html']
+
+
+def test_check_format_rejects_unknown_formats_and_levels():
+    with pytest.raises(ValueError):
+        check_format('rar')
+    with pytest.raises(ValueError):
+        check_format('zip', 10)
+    with pytest.raises(ValueError):
+        ArchiveWriter('tar.gz', -1)
+    check_format('zip', 0)
+
+
+def test_random_payloads_round_trip():
+    rng = random.Random(0)
+    files = [File(f'blob{i}.bin', rng.randbytes(rng.randrange(0, 3000))) for i in range(20)]
+    for fmt in archive.available_formats():
+        assert read_members(write_archive(files, fmt), fmt) == expected(files)
+
@@ -0,0 +1,220 @@
+import hashlib
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import artifacts  # noqa: E402
+from artifacts import (  # noqa: E402
+    RANGE_CHUNK_BYTES, ArtifactStore, RangeNotSatisfiable, StoredArtifact, artifact_response, parse_byte_range,
+    record_hit
+)
+
+# Spans several read chunks, so ranges crossing chunk boundaries are covered
+FULL = bytes(range(256)) * ((2 * RANGE_CHUNK_BYTES + 1000) // 256)
+SIZE = len(FULL)
+DIGEST = hashlib.sha256(FULL).hexdigest()
+ETAG = f'"{DIGEST}"'
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=100-', (100, SIZE - 1)),
+    ('bytes=-500', (SIZE - 500, SIZE - 1)),
+    ('bytes=-999999999', (0, SIZE - 1)),
+    ('bytes=10-999999999', (10, SIZE - 1)),
+    (' bytes=5-5 ', (5, 5)),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize('header', ['bytes=99-10', 'bytes=-', 'bytes=0-1,5-9', 'items=0-1', 'bytes=a-b'])
+def test_parse_byte_range_ignores_reversed_multiple_and_malformed_ranges(header):
+    assert parse_byte_range(header, SIZE) is None
+
+
+@pytest.mark.parametrize('header', [f'bytes={SIZE}-', f'bytes={SIZE + 10}-{SIZE + 20}', 'bytes=-0'])
+def test_parse_byte_range_rejects_unsatisfiable_ranges(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_byte_range(header, SIZE)
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / 'artifact.zip'
+    path.write_bytes(FULL)
+    artifact = StoredArtifact(str(path), DIGEST, SIZE, 0.5)
+
+    async def download(request):
+        return artifact_response(
+            artifact, 'portfolio.zip', 'application/zip',
+            request.headers.get('range'), request.headers.get('if-range')
+        )
+
+    with TestClient(Starlette(routes=[Route('/download', download)])) as test_client:
+        yield test_client
+
+
+def test_full_download_advertises_ranges(client):
+    response = client.get('/download')
+    assert response.status_code == 200
+    assert response.content == FULL
+    assert response.headers['accept-ranges'] == 'bytes'
+    assert response.headers['etag'] == ETAG
+
+
+@pytest.mark.parametrize('header, start, end', [
+    ('bytes=0-0', 0, 0),
+    (f'bytes={RANGE_CHUNK_BYTES - 10}-{RANGE_CHUNK_BYTES + 10}', RANGE_CHUNK_BYTES - 10, RANGE_CHUNK_BYTES + 10),
+    ('bytes=1000-', 1000, SIZE - 1),
+    ('bytes=-700', SIZE - 700, SIZE - 1),
+])
+def test_partial_content_is_the_requested_slice(client, header, start, end):
+    response = client.get('/download', headers={'Range': header})
+    assert response.status_code == 206
+    assert response.content == FULL[start:end + 1]
+    assert response.headers['content-range'] == f'bytes {start}-{end}/{SIZE}'
+    assert response.headers['content-length'] == str(end - start + 1)
+
+
+def test_matching_if_range_resumes(client):
+    response = client.get('/download', headers={'Range': 'bytes=500-', 'If-Range': ETAG})
+    assert response.status_code == 206
+    assert response.content == FULL[500:]
+
+
+def test_stale_if_range_gets_the_whole_file(client):
+    response = client.get('/download', headers={'Range': 'bytes=500-', 'If-Range': '"older-version"'})
+    assert response.status_code == 200
+    assert response.content == FULL
+    assert 'content-range' not in response.headers
+
+
+def test_range_past_the_end_is_416(client):
+    response = client.get('/download', headers={'Range': f'bytes={SIZE}-'})
+    assert response.status_code == 416
+    assert response.headers['content-range'] == f'bytes */{SIZE}'
+
+
+def test_reversed_range_is_ignored(client):
+    response = client.get('/download', headers={'Range': 'bytes=900-100'})
+    assert response.status_code == 200
+    assert response.content == FULL
+
+
+def blob(i: int, size: int = 1000) -> bytes:
+    return i.to_bytes(4, 'big') * (size // 4)
+
+
+def disk_bytes(root: Path) -> int:
+    return sum(path.stat().st_size for path in (root / 'objects').glob('*/*'))
+
+
+def age(store: ArtifactStore, key: str, seconds_ago: float):
+    when = time.time() - seconds_ago
+    os.utime(store.get(key).path, (when, when))
+
+
+def test_store_round_trips_and_shares_identical_objects(tmp_path):
+    store = ArtifactStore(tmp_path, 10000)
+    first = store.put('a', blob(1), 0.25)
+    second = store.put('b', blob(1), 0.5)
+    assert first.digest == second.digest == hashlib.sha256(blob(1)).hexdigest()
+    assert Path(store.get('a').path).read_bytes() == blob(1)
+    assert store.get('b').render_seconds == 0.5
+    assert store.get('missing') is None
+    assert disk_bytes(tmp_path) == 1000
+    assert (tmp_path / 'size').read_text() == '1000'
+    # Writes are staged and renamed, so nothing is left behind in tmp/
+    assert list((tmp_path / 'tmp').iterdir()) == []
+
+
+def test_least_recently_used_objects_are_evicted_first(tmp_path):
+    store = ArtifactStore(tmp_path, 10000)
+    for i in range(9):
+        store.put(f'k{i}', blob(i), 0)
+        age(store, f'k{i}', 1000 - i)
+    # Reading k0 makes it the most recently used
+    assert store.get('k0') is not None
+    store.put('k9', blob(9), 0)
+    store.put('k10', blob(10), 0)
+
+    present = [i for i in range(11) if store.get(f'k{i}') is not None]
+    assert present == [0, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert disk_bytes(tmp_path) == 9000
+    assert (tmp_path / 'size').read_text() == '9000'
+
+
+def test_refs_to_evicted_objects_are_pruned(tmp_path):
+    store = ArtifactStore(tmp_path, 10000)
+    for i in range(10):
+        store.put(f'k{i}', blob(i), 0)
+        age(store, f'k{i}', 1000 - i)
+    # Two keys for one object: both refs go when it is evicted
+    store.put('k0-copy', blob(0), 0)
+    age(store, 'k0', 1000)
+    store.put('k10', blob(10), 0)
+
+    refs = list((tmp_path / 'refs').glob('*/*'))
+    assert len(refs) == 9
+    assert store.get('k0') is None and store.get('k0-copy') is None and store.get('k1') is None
+
+
+@pytest.mark.skipif(artifacts.fcntl is None, reason='the shared size file needs fcntl')
+def test_cap_holds_across_stores_sharing_a_directory(tmp_path):
+    # Two workers' stores over one directory: each sees the other's writes
+    # through the shared size file
+    workers = [ArtifactStore(tmp_path, 10000), ArtifactStore(tmp_path, 10000)]
+    for i in range(40):
+        workers[i % 2].put(f'k{i}', blob(i), 0)
+        assert disk_bytes(tmp_path) <= 10000
+        assert int((tmp_path / 'size').read_text()) == disk_bytes(tmp_path)
+    assert disk_bytes(tmp_path) >= 9000
+
+
+def test_new_store_recounts_the_size_and_removes_stale_staging_files(tmp_path):
+    store = ArtifactStore(tmp_path, 10000)
+    store.put('a', blob(1), 0)
+    (tmp_path / 'size').write_text('123456')
+    stale = tmp_path / 'tmp' / 'crashed.tmp'
+    stale.write_bytes(b'partial')
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+    in_flight = tmp_path / 'tmp' / 'writing.tmp'
+    in_flight.write_bytes(b'partial')
+
+    ArtifactStore(tmp_path, 10000)
+    assert (tmp_path / 'size').read_text() == '1000'
+    assert not stale.exists() and in_flight.exists()
+
+
+def test_refs_record_who_built_the_artifact(tmp_path):
+    store = ArtifactStore(tmp_path, 10000)
+    store.put('pre', blob(1), 0.5, built_by='prerender')
+    # Same bytes, different key and builder: the ref, not the object, carries it
+    store.put('inline', blob(1), 0.25, built_by='download')
+    store.put('legacy', blob(2), 0.25)
+    assert store.get('pre').built_by == 'prerender'
+    assert store.get('inline').built_by == 'download'
+    assert store.get('legacy').built_by is None
+
+
+def test_only_prebuilt_hits_count_as_prerender_hits(tmp_path):
+    counters = (artifacts.store_hits, artifacts.prerender_hits, artifacts.prerender_seconds_saved)
+    before = [counter.total() for counter in counters]
+    for built_by, seconds in [('prerender', 2.0), ('rerender', 1.0), ('download', 4.0), (None, 8.0)]:
+        record_hit(StoredArtifact('unused', DIGEST, SIZE, seconds, built_by))
+    store_hits, prerender_hits, seconds_saved = (
+        counter.total() - start for counter, start in zip(counters, before)
+    )
+    assert store_hits == 4
+    assert prerender_hits == 2
+    assert seconds_saved == 3.0
+    assert artifacts.store_hits.value(built_by='unknown') >= 1
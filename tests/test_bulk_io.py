@@ -0,0 +1,112 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import bulk_io  # noqa: E402
+from bulk_io import BulkImporter, LineTooLong, iter_ndjson_lines  # noqa: E402
+
+
+async def stream(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def split_lines(chunks):
+    async def run():
+        return [item async for item in iter_ndjson_lines(stream(chunks))]
+    return asyncio.run(run())
+
+
+BODY = b'{"a": 1}\n\n  {"b": 2}  \r\n{"c": 3}\r\n\r\n{"d": 4}'
+EXPECTED = [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (4, b'{"c": 3}'), (6, b'{"d": 4}')]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 16, len(BODY)])
+def test_lines_are_the_same_however_the_body_is_chunked(size):
+    chunks = [BODY[i:i + size] for i in range(0, len(BODY), size)]
+    assert split_lines(chunks) == EXPECTED
+
+
+def test_empty_chunks_and_bodies_yield_nothing():
+    assert split_lines([]) == []
+    assert split_lines([b'', b'\n', b'', b'\r\n  \n']) == []
+
+
+def test_trailing_line_without_newline_is_kept():
+    assert split_lines([b'{"a": 1}\n{"b"', b': 2}']) == [(1, b'{"a": 1}'), (2, b'{"b": 2}')]
+
+
+def test_oversized_line_stops_the_stream(monkeypatch):
+    monkeypatch.setattr(bulk_io, 'MAX_LINE_BYTES', 16)
+    seen = []
+
+    async def run():
+        async for item in iter_ndjson_lines(stream([b'{"a": 1}\n', b'x' * 10, b'x' * 10, b'\n{"b": 2}\n'])):
+            seen.append(item)
+
+    with pytest.raises(LineTooLong, match='Line 2 exceeds 16 bytes'):
+        asyncio.run(run())
+    assert seen == [(1, b'{"a": 1}')]
+
+
+def test_line_too_long_is_a_value_error():
+    assert issubclass(LineTooLong, ValueError)
+
+
+def test_duplicate_key_errors_map_back_to_their_lines():
+    mongomock_motor = pytest.importorskip('mongomock_motor')
+
+    async def run():
+        collection = mongomock_motor.AsyncMongoMockClient()['test'].portfolios
+        await collection.create_index('id', unique=True)
+        importer = BulkImporter(collection, batch_size=3)
+        # Line numbers skip the blank and invalid lines the caller filtered out
+        for line_no, doc_id in [(1, 'a'), (2, 'b'), (4, 'a'), (5, 'c'), (7, 'b'), (8, 'd'), (9, 'd')]:
+            await importer.add(line_no, {'id': doc_id})
+        importer.record_error(3, 'invalid JSON')
+        return await importer.finish(), await collection.count_documents({})
+
+    report, stored = asyncio.run(run())
+    assert report['inserted'] == stored == 4
+    assert report['failed'] == 4
+    assert sorted(error['line'] for error in report['errors']) == [3, 4, 7, 9]
+    assert not report['errorsTruncated']
+
+
+def test_error_list_is_truncated_but_counted():
+    importer = BulkImporter(None, batch_size=10, max_errors=2)
+    for line_no in range(5):
+        importer.record_error(line_no, 'bad')
+    report = asyncio.run(importer.finish())
+    assert report['failed'] == 5 and len(report['errors']) == 2 and report['errorsTruncated']
+
+
+class FailingCollection:
+    def __init__(self):
+        self.calls = 0
+
+    async def insert_many(self, docs, ordered=True):
+        self.calls += 1
+        raise RuntimeError('connection reset')
+
+
+def test_failed_insert_is_raised_once_and_not_retried():
+    async def run():
+        collection = FailingCollection()
+        importer = BulkImporter(collection, batch_size=1)
+        await importer.add(1, {'id': 'a'})
+        with pytest.raises(RuntimeError):
+            # Waits for the first batch before sending the second
+            await importer.add(2, {'id': 'b'})
+        await importer.add(3, {'id': 'c'})
+        # Cleanup after a failed import must not raise the same error again
+        await importer.abort()
+        return collection.calls, importer._pending, importer._docs
+
+    calls, pending, docs = asyncio.run(run())
+    assert calls == 2
+    assert pending is None and docs == []
@@ -0,0 +1,87 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from idempotency import IdempotencyStore  # noqa: E402
+
+mongomock_motor = pytest.importorskip('mongomock_motor')
+
+
+def make_store():
+    db = mongomock_motor.AsyncMongoMockClient()['test']
+    return IdempotencyStore(db.idempotency_keys, ttl_seconds=600), db.portfolios
+
+
+def holds_content_in(portfolios):
+    async def holds_content(portfolio_id, content_hash):
+        return await portfolios.find_one({'id': portfolio_id, 'contentHash': content_hash}) is not None
+    return holds_content
+
+
+def test_duplicates_during_a_pending_insert_resolve_to_the_first_claim():
+    async def run():
+        store, portfolios = make_store()
+        holds_content = holds_content_in(portfolios)
+        keys = IdempotencyStore.keys_for(None, 'h1')
+        assert await store.claim(keys, 'first', holds_content) is None
+        # The first request has not inserted its portfolio yet
+        results = await asyncio.gather(
+            store.claim(keys, 'second', holds_content),
+            store.claim(keys, 'third', holds_content)
+        )
+        await portfolios.insert_one({'id': 'first', 'contentHash': 'h1'})
+        await store.commit('first')
+        return results, await store.claim(keys, 'fourth', holds_content)
+
+    results, after_commit = asyncio.run(run())
+    assert results == ['first', 'first']
+    assert after_commit == 'first'
+
+
+def test_committed_hash_is_taken_over_once_the_content_changes():
+    async def run():
+        store, portfolios = make_store()
+        holds_content = holds_content_in(portfolios)
+        keys = IdempotencyStore.keys_for(None, 'h1')
+        await store.claim(keys, 'first', holds_content)
+        await portfolios.insert_one({'id': 'first', 'contentHash': 'h1'})
+        await store.commit('first')
+        await portfolios.update_one({'id': 'first'}, {'$set': {'contentHash': 'h2'}})
+        taken_over = await store.claim(keys, 'second', holds_content)
+        return taken_over, await store.claim(keys, 'third', holds_content)
+
+    taken_over, later = asyncio.run(run())
+    assert taken_over is None
+    assert later == 'second'
+
+
+def test_stale_pending_claim_without_a_portfolio_is_taken_over():
+    async def run():
+        store, portfolios = make_store()
+        keys = IdempotencyStore.keys_for(None, 'h1')
+        await store.claim(keys, 'crashed', holds_content_in(portfolios))
+        await store.collection.update_one(
+            {'_id': keys[0]}, {'$set': {'createdAt': datetime.utcnow() - timedelta(minutes=5)}}
+        )
+        return await store.claim(keys, 'second', holds_content_in(portfolios))
+
+    assert asyncio.run(run()) is None
+
+
+def test_idempotency_key_replays_and_failed_writes_release_claims():
+    async def run():
+        store, portfolios = make_store()
+        keys = IdempotencyStore.keys_for('k1', 'h1')
+        assert await store.claim(keys, 'first') is None
+        replay = await store.claim(keys, 'second')
+        await store.release(keys, 'first')
+        return replay, await store.claim(keys, 'third')
+
+    replay, after_release = asyncio.run(run())
+    assert replay == 'first'
+    assert after_release is None
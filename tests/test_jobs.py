@@ -0,0 +1,106 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from jobs import BackgroundJob  # noqa: E402
+
+mongomock_motor = pytest.importorskip('mongomock_motor')
+
+
+def shared_collection():
+    return mongomock_motor.AsyncMongoMockClient()['test'].admin_jobs
+
+
+def gated_run(release: asyncio.Event):
+    async def run(job):
+        job.add(processed=3)
+        await release.wait()
+    return run
+
+
+def test_second_worker_cannot_start_a_running_job_and_sees_its_progress():
+    async def run():
+        collection = shared_collection()
+        release = asyncio.Event()
+        # Two workers: same job name, same collection, separate processes' state
+        first = BackgroundJob('normalize', gated_run(release), collection, lease_seconds=0.15)
+        second = BackgroundJob('normalize', gated_run(release), collection, lease_seconds=0.15)
+        assert await first.start()
+        started_elsewhere = await second.start()
+        await asyncio.sleep(0.1)  # one heartbeat
+        seen = await second.status()
+        release.set()
+        await first._task
+        finished = await second.status()
+        return started_elsewhere, seen, finished, await second.start()
+
+    started_elsewhere, seen, finished, restarted = asyncio.run(run())
+    assert started_elsewhere is False
+    assert seen['state'] == 'running' and seen['progress'] == {'processed': 3}
+    assert finished['state'] == 'done' and finished['finishedAt'] is not None
+    assert restarted is True
+
+
+def test_run_of_a_dead_worker_is_failed_and_restartable_once_the_lease_lapses():
+    async def run():
+        collection = shared_collection()
+        await collection.insert_one({
+            '_id': 'rerender', 'state': 'running', 'progress': {'processed': 7}, 'owner': 'gone:1:abc',
+            'startedAt': datetime.utcnow() - timedelta(minutes=5),
+            'leaseUntil': datetime.utcnow() - timedelta(minutes=4),
+        })
+        job = BackgroundJob('rerender', lambda job: asyncio.sleep(0), collection)
+        stale = await job.status()
+        assert await job.start()
+        await job._task
+        return stale, await collection.find_one({'_id': 'rerender'})
+
+    stale, doc = asyncio.run(run())
+    assert stale['state'] == 'failed' and 'gone:1:abc' in stale['error']
+    assert stale['progress'] == {'processed': 7}
+    assert doc['state'] == 'done' and doc['leaseUntil'] is None
+
+
+def test_worker_that_lost_its_lease_stops_without_overwriting_the_new_run():
+    async def run():
+        collection = shared_collection()
+        job = BackgroundJob('normalize', gated_run(asyncio.Event()), collection, lease_seconds=0.15)
+        assert await job.start()
+        await collection.update_one({'_id': 'normalize'}, {'$set': {'owner': 'other:2:def', 'state': 'running'}})
+        await asyncio.wait_for(asyncio.gather(job._task, return_exceptions=True), 1)
+        return job.state, await collection.find_one({'_id': 'normalize'})
+
+    state, doc = asyncio.run(run())
+    assert state == 'cancelled'
+    assert doc['owner'] == 'other:2:def' and doc['state'] == 'running'
+
+
+def test_failures_are_recorded_for_every_worker():
+    async def fail(job):
+        raise RuntimeError('boom')
+
+    async def run():
+        collection = shared_collection()
+        job = BackgroundJob('normalize', fail, collection)
+        await job.start()
+        await asyncio.gather(job._task, return_exceptions=True)
+        return await BackgroundJob('normalize', fail, collection).status()
+
+    status = asyncio.run(run())
+    assert status['state'] == 'failed' and status['error'] == 'boom'
+
+
+def test_without_a_collection_state_is_local():
+    async def run():
+        job = BackgroundJob('normalize', lambda job: asyncio.sleep(0))
+        assert await job.start()
+        assert not await job.start()
+        await job._task
+        return await job.status()
+
+    assert asyncio.run(run())['state'] == 'done'
@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from minify import minify_css, minify_html, minify_html_stream  # noqa: E402
+
+DOC = '''<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <!-- page metadata -->
+    <meta charset="UTF-8">
+    <title>  Jane   Doe  </title>
+    <style>
+      body  {  margin : 0 ;  }
+
+      /* keep   this */
+    </style>
+    <!--[if IE]><link rel="stylesheet" href="ie.css"><![endif]-->
+  </head>
+  <body>
+
+
+    <div class="hero"
+         data-role="banner">   Hello,    world   </div>
+    <!--
+      multi-line
+      comment -->
+    <pre>
+  keep   this
+      indentation
+    </pre>
+    <p>before</p><script>
+      if (a  <  b) { run(); }
+    </script><p>after</p>
+    <textarea>  raw
+  text </textarea>
+    <ul>
+''' + ''.join(f'      <li>  Item {i}  <!-- note {i} --></li>\n' for i in range(50)) + '''    </ul>
+  </body>
+</html>
+'''
+
+
+def chunked(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 7, 11, 16, 64, 257, 1024, len(DOC)])
+def test_stream_matches_whole_document(size):
+    assert ''.join(minify_html_stream(chunked(DOC, size))) == minify_html(DOC)
+
+
+def test_stream_matches_whole_document_for_every_two_way_split():
+    # Covers cuts inside every tag, comment, raw element and whitespace run
+    expected = minify_html(DOC)
+    for cut in range(len(DOC) + 1):
+        assert ''.join(minify_html_stream([DOC[:cut], DOC[cut:]])) == expected, cut
+
+
+@pytest.mark.parametrize('size', [1, 4, 32])
+def test_stream_handles_unclosed_raw_elements_and_comments(size):
+    doc = '<p>a</p>\n<style>\n  b { c: d }\n\n<!-- open\n\n  <p>  e  </p>\n'
+    assert ''.join(minify_html_stream(chunked(doc, size))) == minify_html(doc)
+
+
+def test_stream_of_nothing_is_empty():
+    assert list(minify_html_stream([])) == []
+    assert ''.join(minify_html_stream(['', '  \n', '<!-- x -->', '\n'])) == minify_html('  \n<!-- x -->\n') == ''
+
+
+def test_minify_html_keeps_raw_elements_and_conditional_comments():
+    html = minify_html(DOC)
+    assert '<pre>\n  keep   this\n      indentation\n    </pre>' in html
+    assert 'if (a  <  b) { run(); }' in html
+    assert '<!--[if IE]>' in html
+    assert 'page metadata' not in html and 'note 3' not in html
+    assert '<title> Jane Doe </title>' in html
+
+
+def test_minify_css():
+    assert minify_css('a  {  color:  red ;  }\n/* c */\nb > i , p { margin: 0 }') == 'a{color:red}b>i,p{margin:0}'
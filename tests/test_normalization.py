@@ -0,0 +1,166 @@
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from idempotency import content_hash  # noqa: E402
+from jobs import BackgroundJob  # noqa: E402
+from normalization import (  # noqa: E402
+    CONTENT_FIELDS, NORMALIZATION_VERSION, backfill_normalization, normalize_fields, normalized_update,
+    split_technologies
+)
+
+
+def full_portfolio(**overrides):
+    doc = {
+        'name': '  Ada Lovelace ',
+        'title': 'Engineer\n',
+        'email': 'ada@example.com',
+        'phone': '',
+        'about': ' Notes on the engine ',
+        'education': [{'school': ' Home ', 'year': 1830}],
+        'skills': [' Python', 'Go '],
+        'projects': [{'name': ' Engine ', 'technologies': ' Python , C,, Rust '}],
+        'experience': [],
+        'selectedTemplate': 'tech-modern',
+    }
+    doc.update(overrides)
+    return doc
+
+
+@pytest.mark.parametrize('technologies, expected', [
+    (None, ()),
+    ('', ()),
+    ([], ()),
+    ('Python', ('Python',)),
+    (' a ,b,, c ', ('a', 'b', '', 'c')),
+    ([' a', 'b '], ('a', 'b')),
+])
+def test_split_technologies(technologies, expected):
+    assert split_technologies(technologies) == expected
+
+
+def test_complete_portfolio_is_trimmed_and_hashed():
+    normalized = normalize_fields(full_portfolio())
+    assert normalized['name'] == 'Ada Lovelace'
+    assert normalized['skills'] == ['Python', 'Go']
+    assert normalized['education'] == [{'school': 'Home', 'year': 1830}]
+    assert normalized['projects'] == [{
+        'name': 'Engine', 'technologies': 'Python , C,, Rust', 'technologyList': ['Python', 'C', '', 'Rust']
+    }]
+    assert normalized['normalizedVersion'] == NORMALIZATION_VERSION
+    assert len(normalized['contentHash']) == 64
+
+
+def test_partial_fields_are_trimmed_but_not_hashed():
+    normalized = normalize_fields({'name': ' Ada ', 'updatedAt': 'kept'})
+    assert normalized == {'name': 'Ada', 'updatedAt': 'kept'}
+
+
+def test_input_is_not_mutated():
+    doc = full_portfolio()
+    normalize_fields(doc)
+    assert doc == full_portfolio()
+
+
+def test_stale_technology_list_is_rederived_and_not_hashed():
+    fresh = normalize_fields(full_portfolio())
+    stale = normalize_fields(full_portfolio(projects=[
+        {'name': 'Engine', 'technologies': 'Python , C,, Rust', 'technologyList': ['COBOL']}
+    ]))
+    assert stale['projects'][0]['technologyList'] == ['Python', 'C', '', 'Rust']
+    assert stale['contentHash'] == fresh['contentHash']
+
+
+def test_hash_ignores_whitespace_and_covers_content_and_template():
+    base = normalize_fields(full_portfolio())['contentHash']
+    assert normalize_fields(full_portfolio(name='Ada Lovelace'))['contentHash'] == base
+    assert normalize_fields(full_portfolio(name='Ada Byron'))['contentHash'] != base
+    assert normalize_fields(full_portfolio(selectedTemplate='minimal-professional'))['contentHash'] != base
+
+
+@pytest.mark.parametrize('education', [
+    [{'school': 'Home', 'year': 1830}],
+    [{'school': 'Home', 'gpa': 3.5, 'since': datetime(2020, 1, 1), 'big': 10 ** 20}],
+])
+def test_hash_matches_the_canonical_stdlib_encoding(education):
+    # Plain content may be hashed through orjson; it must produce the same bytes
+    normalized = normalize_fields(full_portfolio(education=education))
+    content = {field: normalized[field] for field in CONTENT_FIELDS}
+    content['projects'] = [{k: v for k, v in proj.items() if k != 'technologyList'} for proj in content['projects']]
+    assert normalized['contentHash'] == content_hash(content, 'tech-modern')
+
+
+def test_missing_projects_hash_like_an_empty_list():
+    assert (normalize_fields(full_portfolio(projects=None))['contentHash']
+            == normalize_fields(full_portfolio(projects=[]))['contentHash'])
+
+
+def test_hash_is_stable_after_a_partial_patch():
+    stored = normalize_fields(full_portfolio())
+    # A PATCH writes only the changed fields; the document then holds a mix of
+    # freshly normalized and previously stored values
+    changes = normalize_fields({'about': '  Notes on the engine  ', 'skills': ['Python ', ' Go']})
+    patched = {**stored, **changes}
+    assert normalized_update(patched)['contentHash'] == stored['contentHash']
+
+    changes = normalize_fields({'about': 'New notes'})
+    patched = {**stored, **changes}
+    rehashed = normalized_update(patched)['contentHash']
+    assert rehashed != stored['contentHash']
+    assert rehashed == normalize_fields(full_portfolio(about='New notes'))['contentHash']
+
+
+def test_normalized_update_sets_only_content_and_derived_fields():
+    update = normalized_update({'_id': 1, 'id': 'p1', 'updatedAt': 'x', **full_portfolio()})
+    assert set(update) == {*CONTENT_FIELDS, 'contentHash', 'normalizedVersion'}
+
+
+class EditDuringBackfill:
+    """Collection wrapper that edits a document between the read and the write"""
+
+    def __init__(self, collection, edited_id, at_write):
+        self.collection = collection
+        self.edited_id = edited_id
+        self.at_write = at_write
+        self.writes = 0
+
+    def find(self, *args, **kwargs):
+        return self.collection.find(*args, **kwargs)
+
+    async def bulk_write(self, requests, **kwargs):
+        self.writes += 1
+        if self.writes == self.at_write:
+            await self.collection.update_one(
+                {'id': self.edited_id}, {'$set': {'name': 'Edited', 'updatedAt': datetime(2026, 2, 1)}}
+            )
+        return await self.collection.bulk_write(requests, **kwargs)
+
+
+def test_backfill_skips_documents_edited_meanwhile():
+    mongomock_motor = pytest.importorskip('mongomock_motor')
+
+    async def run():
+        collection = mongomock_motor.AsyncMongoMockClient()['test'].portfolios
+        await collection.insert_many([
+            {'id': f'p{i}', 'updatedAt': datetime(2026, 1, 1), **full_portfolio()} for i in range(5)
+        ])
+        await collection.insert_one({'id': 'done', 'normalizedVersion': NORMALIZATION_VERSION, 'name': ' x '})
+        job = BackgroundJob('normalize', None)
+        updated = []
+        # p2 is in the second batch of two
+        collection_view = EditDuringBackfill(collection, 'p2', at_write=2)
+        await backfill_normalization(collection_view, job, batch_size=2, on_updated=updated.append)
+        docs = {doc['id']: doc async for doc in collection.find()}
+        return job.progress, updated, docs
+
+    progress, updated, docs = asyncio.run(run())
+    assert progress == {'processed': 5, 'updated': 4, 'skipped': 1, 'failed': 0}
+    assert 'done' not in updated
+    assert docs['p2']['name'] == 'Edited' and 'normalizedVersion' not in docs['p2']
+    assert docs['p0']['name'] == 'Ada Lovelace' and docs['p0']['normalizedVersion'] == NORMALIZATION_VERSION
+    assert docs['done']['name'] == ' x '
@@ -0,0 +1,87 @@
+import hashlib
+import io
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from archive import ZIP_TIMESTAMP  # noqa: E402
+import template_generator  # noqa: E402
+from minify import minify_html  # noqa: E402
+from template_generator import TEMPLATES, TemplateGenerator  # noqa: E402
+
+PORTFOLIO = {
+    'name': 'Jane Doe',
+    'title': 'Engineer',
+    'email': 'jane@example.com',
+    'phone': '555-0100',
+    'about': 'Builds things.',
+    'education': [{'institution': 'State University', 'degree': 'BSc', 'year': '2020', 'description': 'CS'}],
+    'skills': [{'name': 'Python', 'level': 'advanced'}],
+    'projects': [{'title': 'Site', 'description': 'A site', 'technologies': 'React, FastAPI', 'link': ''}],
+    'experience': [{'company': 'Acme', 'position': 'Dev', 'duration': '2y', 'description': 'Shipped'}],
+}
+
+
+def test_generate_zip_is_reproducible():
+    generator = TemplateGenerator()
+    first = {template: generator.generate_zip(dict(PORTFOLIO), template) for template in TEMPLATES}
+    # Cross a ZIP timestamp boundary (2s resolution) between the two renders
+    time.sleep(2)
+    for template in TEMPLATES:
+        second = generator.generate_zip(dict(PORTFOLIO), template)
+        assert second == first[template]
+        assert hashlib.sha256(second).hexdigest() == hashlib.sha256(first[template]).hexdigest()
+
+
+def test_generate_zip_metadata_is_fixed():
+    archive = zipfile.ZipFile(io.BytesIO(TemplateGenerator().generate_zip(PORTFOLIO, 'creative-bold')))
+    assert archive.namelist() == ['README.md', 'index.html']
+    for info in archive.infolist():
+        assert info.date_time == ZIP_TIMESTAMP
+        assert info.external_attr >> 16 == 0o100644
+
+
+def large_portfolio(items: int = 40) -> dict:
+    return {
+        **PORTFOLIO,
+        'about': 'Line one.\n\n   Line   two.',
+        'projects': [
+            {'title': f'Project {i}', 'description': f'  Did   thing {i}  ', 'technologies': 'A, B', 'link': ''}
+            for i in range(items)
+        ],
+        'experience': PORTFOLIO['experience'] * items,
+    }
+
+
+@pytest.mark.parametrize('template', TEMPLATES)
+@pytest.mark.parametrize('minify', [False, True])
+def test_iter_html_joins_to_generate_html(template, minify):
+    generator = TemplateGenerator()
+    html = generator.generate_html(large_portfolio(), template, minify=minify)
+    assert ''.join(generator.iter_html(large_portfolio(), template, minify=minify)) == html
+    if not minify:
+        assert html.startswith('<!DOCTYPE html>') and html.rstrip().endswith('</html>')
+
+
+@pytest.mark.parametrize('template', TEMPLATES)
+@pytest.mark.parametrize('size', [1, 64, 1000])
+def test_minified_stream_does_not_depend_on_chunk_size(monkeypatch, template, size):
+    generator = TemplateGenerator()
+    whole = generator.generate_html(large_portfolio(), template, minify=True)
+    coalesce = template_generator._coalesce
+    monkeypatch.setattr(template_generator, '_coalesce', lambda chunks: coalesce(chunks, size))
+    assert generator.generate_html(large_portfolio(), template, minify=True) == whole
+
+
+@pytest.mark.parametrize('template', TEMPLATES)
+def test_minified_markup_matches_minify_html(template):
+    # With the stylesheet linked, the only difference minify makes is to the markup
+    generator = TemplateGenerator()
+    plain = generator.generate_html(large_portfolio(), template, stylesheet_href='styles.css')
+    minified = generator.generate_html(large_portfolio(), template, stylesheet_href='styles.css', minify=True)
+    assert minified == minify_html(plain)